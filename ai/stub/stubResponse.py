@@ -94,8 +94,9 @@ def normalize_step(text: str) -> str:
     return normalized.lower()
 
 
-def buildContract(test_case: dict):
+def buildContract(test_case: dict, step_infos: list | None = None, registry: dict | None = None):
     steps = test_case.get("steps", [])
+    registry = GLOBAL_STEP_REGISTRY if registry is None else registry
     class_base = to_pascal(test_case.get("title") or test_case.get("id") or "Case")
     page_class = f"com.autogen.pages.{class_base}Page"
     notes = []
@@ -145,10 +146,11 @@ def buildContract(test_case: dict):
     for idx, text in enumerate(steps):
         params = detect_parameters(text)
         regex_text = re.sub(r'"([^\"]+)"', '"(.*)"', text)
-        interaction = detect_interaction(text, bool(params))
+        info = step_infos[idx] if step_infos else None
+        interaction = info["interaction"] if info else detect_interaction(text, bool(params))
         base_name = to_camel(text)
         normalized = normalize_step(regex_text)
-        shared = GLOBAL_STEP_REGISTRY.get(normalized)
+        shared = registry.get(normalized)
         if shared:
             glue_class = shared['glue']
             method_name = shared['method']
@@ -156,7 +158,7 @@ def buildContract(test_case: dict):
         else:
             glue_class = f"com.autogen.steps.{class_base}Steps"
             method_name = base_name or f"step{idx + 1}"
-            GLOBAL_STEP_REGISTRY[normalized] = {"glue": glue_class, "method": method_name}
+            registry[normalized] = {"glue": glue_class, "method": method_name}
             reuses_existing = False
         contracts["stepDefinitions"].append({
             "stepText": regex_text,
@@ -173,6 +175,6 @@ def buildContract(test_case: dict):
         })
         contracts["pageObjects"][0]["methods"].append({
             "name": base_name,
-            "locator": suggest_locator(text, idx, test_case.get("url"))
+            "locator": dict(info["locator"]) if info else suggest_locator(text, idx, test_case.get("url"))
         })
     return contracts
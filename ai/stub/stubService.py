@@ -1,35 +1,70 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import gzip
+import importlib.util
 import json
+import random
 from pathlib import Path
 from stubResponse import buildContract
-from jsonschema import Draft7Validator
 
-SCHEMA = json.loads(Path('../../docs/ai_contract.schema.json').read_text(encoding='utf-8'))
-VALIDATOR = Draft7Validator(SCHEMA)
+VALIDATOR_PATH = Path(__file__).resolve().parents[2] / 'cli/src/validator.py'
+spec = importlib.util.spec_from_file_location('contractValidator', VALIDATOR_PATH)
+validator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(validator)  # type: ignore
 
 class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    fail_rate = 0.0
+    retry_after = 1
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('accept-encoding', '')
+        if gzipped:
+            body = gzip.compress(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_POST(self):
-        if self.path != '/generate':
-            self.send_error(404)
-            return
         length = int(self.headers.get('content-length', '0'))
         body = self.rfile.read(length)
+        if self.path != '/generate':
+            self.send_json(404, { 'error': 'not found' })
+            return
+        if random.random() < self.fail_rate:
+            self.send_json(429, { 'error': 'quota exceeded' }, { 'Retry-After': str(self.retry_after) })
+            return
+        if self.headers.get('content-encoding') == 'gzip':
+            body = gzip.decompress(body)
         test_case = json.loads(body)
         contract = buildContract(test_case)
-        errors = sorted(VALIDATOR.iter_errors(contract), key=lambda e: e.path)
-        if errors:
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({ 'error': 'invalid contract' }).encode('utf-8'))
+        valid, _ = validator.validate_contract(contract)
+        if not valid:
+            self.send_json(500, { 'error': 'invalid contract' })
             return
-        self.send_response(200)
-        self.end_headers()
-        self.wfile.write(json.dumps(contract).encode('utf-8'))
+        self.send_json(200, contract)
 
-def run(port=4000):
-    server = HTTPServer(('', port), Handler)
+def run(port=4000, fail_rate=0.0, retry_after=1):
+    Handler.fail_rate = fail_rate
+    Handler.retry_after = retry_after
+    server = ThreadingHTTPServer(('', port), Handler)
     print(f'Stub listening on port {port}')
     server.serve_forever()
 
 if __name__ == '__main__':
-    run()
+    parser = argparse.ArgumentParser(description='Stub HTTP del contrato IA')
+    parser.add_argument('--port', type=int, default=4000)
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='Probabilidad de responder 429 para simular cuotas agotadas.')
+    parser.add_argument('--retry-after', type=float, default=1,
+                        help='Valor del header Retry-After en las respuestas 429.')
+    args = parser.parse_args()
+    run(args.port, args.fail_rate, args.retry_after)
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.generator import generate_artifacts  # noqa: E402
+from src.local_stub import build_contract  # noqa: E402
+
+HOSTS = ['https://www.mercadolibre.cl', 'https://www.falabella.com', 'https://example.org/login']
+PRODUCTS = ['camiseta', 'zapatos', 'pelota', 'raqueta', 'bicicleta']
+
+
+def build_contracts(count):
+    contracts = []
+    for idx in range(count):
+        host = HOSTS[idx % len(HOSTS)]
+        product = PRODUCTS[idx % len(PRODUCTS)]
+        contracts.append(build_contract({
+            'id': f"BENCH-{idx}",
+            'title': f"Caso de benchmark {idx} {product}",
+            'url': host,
+            'tags': ['@bench'],
+            'steps': [
+                f'Navegar a "{host}"',
+                f'Buscar el producto "{product} {idx}"',
+                f'Ingresar "user{idx}@example.com" en el campo email',
+                'Hacer click en el botón Ingresar',
+                f'Validar resultados en la página {idx % 6}',
+            ],
+        }))
+    return contracts
+
+
+def read_tree(root):
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def measure(label, contracts, workers, repeat):
+    best, tree = None, None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            generate_artifacts(contracts, Path(tmp), workers=workers)
+            elapsed = time.perf_counter() - start
+            tree = read_tree(Path(tmp))
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<22} {best * 1000:9.1f} ms  {len(tree)} archivos")
+    return best, tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara el renderizado serial y paralelo de artefactos")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contracts = build_contracts(args.count)
+    serial, serial_tree = measure("serial", contracts, 1, args.repeat)
+    parallel, parallel_tree = measure(f"paralelo ({args.workers} procesos)", contracts, args.workers, args.repeat)
+    if serial_tree != parallel_tree:
+        differing = sorted(name for name in serial_tree.keys() | parallel_tree.keys()
+                           if serial_tree.get(name) != parallel_tree.get(name))
+        raise SystemExit(f"La salida paralela difiere de la serial en {len(differing)} archivos: {differing[:5]}")
+    print(f"{len(contracts)} contratos, salida idéntica; aceleración {serial / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
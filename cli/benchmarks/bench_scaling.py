@@ -0,0 +1,109 @@
+import argparse
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.generator import (  # noqa: E402
+    build_tree, collect_glue_data, glue_jobs, render_chunk, render_feature_file, render_page_object, write_tree,
+)
+from src.local_stub import build_contract  # noqa: E402
+from src.parser import parse_cases  # noqa: E402
+from src.validator import validate_contracts  # noqa: E402
+
+HOSTS = ['https://www.mercadolibre.cl', 'https://www.falabella.com', 'https://example.org/login']
+PRODUCTS = ['camiseta', 'zapatos', 'pelota', 'raqueta', 'bicicleta']
+STEP_TEMPLATES = [
+    'Buscar el producto "{product} {idx}"',
+    'Ingresar "user{idx}@example.com" en el campo email',
+    'Ingresar "clave{idx}" en el campo password',
+    'Hacer click en el botón Ingresar',
+    'Seleccionar el primer registro del listado',
+    'Validar resultados en la página {page}',
+]
+MIN_SECONDS = 0.002
+
+
+def synthesize(path, count, steps):
+    with open(path, 'w', encoding='utf-8') as handle:
+        for idx in range(count):
+            host = HOSTS[idx % len(HOSTS)]
+            product = PRODUCTS[idx % len(PRODUCTS)]
+            handle.write(f"# Caso {idx} {product}\nid: SCALE-{idx}\nurl: {host}\ntags: @t{idx % 4}\npasos:\n")
+            handle.write(f'- Navegar a "{host}"\n')
+            for step in range(steps - 1):
+                template = STEP_TEMPLATES[step % len(STEP_TEMPLATES)]
+                handle.write(f"- {template.format(product=product, idx=idx, page=(idx + step) % 7)}\n")
+            handle.write('\n')
+
+
+def timed(stage, timings, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    timings[stage] = time.perf_counter() - start
+    return result
+
+
+def run_size(count, steps, workdir):
+    source = workdir / f"cases-{count}.txt"
+    synthesize(source, count, steps)
+    timings = {}
+    cases = timed('parse', timings, parse_cases, source)
+    contracts = timed('stub', timings, lambda: [build_contract(case) for case in cases])
+    timed('validate', timings, validate_contracts, contracts)
+    features = timed('features', timings, lambda: [render_feature_file(idx, c) for idx, c in enumerate(contracts)])
+    glue_map = timed('glue', timings, collect_glue_data, contracts)
+    steps_rendered = timed('step classes', timings, render_chunk, glue_jobs(glue_map))
+    pages = timed('page objects', timings,
+                  lambda: [render_page_object(po) for c in contracts for po in c.get('pageObjects', [])])
+    tree = build_tree([*features, *pages, *steps_rendered])
+    timed('write', timings, write_tree, tree, workdir / f"out-{count}", None, 1)
+    return timings
+
+
+def exponent(sizes, seconds):
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t >= MIN_SECONDS]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide cómo escala cada etapa del generador con el número de casos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Cantidades de casos a sintetizar (por ejemplo 100 1000 10000 100000).")
+    parser.add_argument("--steps", type=int, default=6, help="Pasos por caso.")
+    parser.add_argument("--max-exponent", type=float, default=1.25,
+                        help="Falla si alguna etapa crece más rápido que n^x (ajuste log-log).")
+    args = parser.parse_args()
+
+    sizes = sorted(args.sizes)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            results.append(run_size(count, args.steps, Path(tmp)))
+            print(f"{count} casos: " + '  '.join(f"{stage} {secs * 1000:.0f} ms" for stage, secs in results[-1].items()),
+                  flush=True)
+
+    print(f"\n{'etapa':<14}" + ''.join(f"{count:>12}" for count in sizes) + f"{'exponente':>12}")
+    failures = []
+    for stage in results[0]:
+        seconds = [timings[stage] for timings in results]
+        slope = exponent(sizes, seconds)
+        label = '-' if slope is None else f"{slope:.2f}"
+        print(f"{stage:<14}" + ''.join(f"{secs * 1000:>10.1f}ms" for secs in seconds) + f"{label:>12}")
+        if slope is not None and slope > args.max_exponent:
+            failures.append(f"{stage}: crece como n^{slope:.2f}")
+    if failures:
+        raise SystemExit("Escalado super-lineal:\n- " + "\n- ".join(failures))
+    print("Todas las etapas escalan de forma lineal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MAIN = REPO_ROOT / 'cli' / 'main.py'
+HEAVY_MODULES = (
+    'selenium', 'locator_validator', 'locator_harvester',
+    'src.pipeline', 'src.ai_client', 'src.gemini_client', 'src.local_stub', 'src.repair', 'src.validator',
+    'http.client', 'concurrent.futures',
+)
+COMMANDS = {
+    'parse': (['parse', str(REPO_ROOT / 'sample_input.txt')], HEAVY_MODULES),
+    'generate --help': (['generate', '--help'], HEAVY_MODULES),
+    'validate --help': (['validate', '--help'], HEAVY_MODULES),
+    'harvest --help': (['harvest', '--help'], HEAVY_MODULES),
+}
+
+
+def parse_importtime(stderr):
+    total = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total, modules
+
+
+def measure(argv, repeat):
+    imports, walls, modules = [], [], set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', *argv],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise SystemExit(f"Falló `{' '.join(argv)}`:\n{result.stderr}")
+        total, loaded = parse_importtime(result.stderr)
+        imports.append(total)
+        modules |= loaded
+    return statistics.median(imports) / 1000, statistics.median(walls) * 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque del CLI con -X importtime")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ratio", type=float, default=8.0,
+                        help="Falla si los imports de algún subcomando superan este múltiplo de los de un "
+                             "intérprete vacío (mediana), para no depender de la velocidad de la máquina.")
+    args = parser.parse_args()
+
+    bare_ms, bare_wall_ms, _ = measure(['-c', 'pass'], args.repeat)
+    print(f"{'python -c pass':<18} imports {bare_ms:7.1f} ms  total {bare_wall_ms:7.1f} ms")
+    failures = []
+    for label, (argv, forbidden) in COMMANDS.items():
+        import_ms, wall_ms, modules = measure([str(MAIN), *argv], args.repeat)
+        loaded = sorted(name for name in forbidden if name in modules)
+        ratio = import_ms / bare_ms if bare_ms else 0.0
+        print(f"{label:<18} imports {import_ms:7.1f} ms  total {wall_ms:7.1f} ms  módulos {len(modules)}  "
+              f"x{ratio:.1f}")
+        if loaded:
+            failures.append(f"{label}: importa {', '.join(loaded)}")
+        if ratio > args.max_import_ratio:
+            failures.append(f"{label}: imports {ratio:.1f} veces los de un intérprete vacío "
+                            f"(máximo {args.max_import_ratio:g})")
+    if failures:
+        raise SystemExit("Regresión de arranque:\n- " + "\n- ".join(failures))
+    print("Arranque dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
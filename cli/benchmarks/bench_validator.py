@@ -0,0 +1,85 @@
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.local_stub import build_contract  # noqa: E402
+from src.validator import get_schema, validate_contract, validate_contracts  # noqa: E402
+
+STEPS = [
+    'Navegar a "https://www.mercadolibre.cl"',
+    'Buscar el producto "zapatos de futbol"',
+    'Seleccionar el primer registro del listado',
+    'Validar resultados en Mercado Libre',
+    'Ingresar "usuario@example.com" en el campo email',
+    'Hacer click en el botón Ingresar',
+]
+
+
+def build_contracts(count, invalid_every):
+    templates = [
+        build_contract({
+            'id': f"BENCH-{idx}",
+            'title': f"Caso de benchmark {idx}",
+            'url': 'https://www.mercadolibre.cl',
+            'tags': ['@bench'],
+            'steps': STEPS[:2 + idx % (len(STEPS) - 1)],
+        })
+        for idx in range(8)
+    ]
+    contracts = []
+    for idx in range(count):
+        contract = copy.deepcopy(templates[idx % len(templates)])
+        if invalid_every and idx % invalid_every == 0:
+            del contract['stepDefinitions'][0]['methodName']
+        contracts.append(contract)
+    return contracts
+
+
+def measure(label, func, contracts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = func(contracts)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:9.1f} ms  {best / len(contracts) * 1e6:8.2f} µs/contrato")
+    return best, [valid for valid, _ in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara el validador precompilado con jsonschema")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--invalid-every", type=int, default=100,
+                        help="Cada cuántos contratos se inserta uno inválido (0 = todos válidos).")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contracts = build_contracts(args.count, args.invalid_every)
+    fast, fast_results = measure("precompilado (lote)", validate_contracts, contracts, args.repeat)
+    measure("precompilado (uno a uno)", lambda items: [validate_contract(item) for item in items], contracts, args.repeat)
+    try:
+        from jsonschema import Draft7Validator
+    except ImportError:
+        print("jsonschema no está instalado; se omite la comparación")
+        return
+    validator = Draft7Validator(get_schema())
+
+    def with_jsonschema(items):
+        results = []
+        for item in items:
+            errors = sorted(validator.iter_errors(item), key=lambda e: e.path)
+            results.append((not errors, [error.message for error in errors]))
+        return results
+
+    slow, slow_results = measure("jsonschema Draft7Validator", with_jsonschema, contracts, args.repeat)
+    if fast_results != slow_results:
+        raise SystemExit("Los validadores no coinciden en la validez de los contratos")
+    print(f"{len(contracts)} contratos, {fast_results.count(False)} inválidos; aceleración {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -280,11 +280,12 @@ def merge_with_hints(hints_path: Path, case_results: List[Dict]):
     hints_path.write_text(json.dumps(hints, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
-def harvest_locators(args):
-    cases = parse_cases(Path(args.file))
-    if args.cases:
-        requested = {case_id.strip() for case_id in args.cases if case_id.strip()}
-        cases = [case for case in cases if case.get("id") in requested]
+def harvest_locators(args, cases=None):
+    if cases is None:
+        cases = parse_cases(Path(args.file))
+        if args.cases:
+            requested = {case_id.strip() for case_id in args.cases if case_id.strip()}
+            cases = [case for case in cases if case.get("id") in requested]
     driver = build_driver(args.browser, not args.no_headless, args.remote_url)
     results: List[Dict] = []
     try:
@@ -2,68 +2,255 @@ import argparse
 from pathlib import Path
 import json
 
-from src.parser import parse_cases
-from src.generator import generate_artifacts
-from src.history import save_contracts
-from src.validator import validate_contract
-from src.ai_client import request_contract
-from locator_validator import validate_locators
-from locator_harvester import harvest_locators
+from src.ingest import CaseCatalog, expand_inputs, iter_case_files
+
+
+def iter_selected_cases(args, action, catalog=None):
+    catalog = catalog if catalog is not None else CaseCatalog()
+    requested = {case_id.strip() for case_id in args.cases or [] if case_id.strip()}
+    tags = {tag if tag.startswith("@") else f"@{tag}" for tag in args.tags or [] if tag.strip()}
+    paths = expand_inputs(args.files)
+    if len(paths) > 1:
+        catalog.check(paths, requested, tags)
+    files = iter_case_files(paths, requested, tags, args.workers)
+    if not args.cases and not args.tags:
+        yield from catalog.iter_cases(files)
+        return
+    selected = list(catalog.iter_cases(files))
+    missing = sorted(requested - {case.get("id") for case in selected})
+    if missing:
+        raise ValueError(f"Casos no encontrados en {', '.join(args.files)}: {', '.join(missing)}")
+    if not selected:
+        raise ValueError(f"No se seleccionó ningún caso válido para {action}.")
+    yield from selected
+
+
+def select_cases(args, action):
+    return list(iter_selected_cases(args, action))
+
+
+def add_input_arguments(parser, help_text):
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="Archivos de casos, directorios (se buscan *.txt) o patrones glob.")
+    parser.add_argument("--case", dest="cases", action="append", help=help_text)
+    parser.add_argument("--tag", dest="tags", action="append",
+                        help="Filtra por tag (con o sin @). Repite esta bandera para múltiples valores.")
+    parser.add_argument("--workers", type=int,
+                        help="Procesos para leer archivos y renderizar artefactos en paralelo (por defecto, uno por núcleo).")
 
 
 def cmd_parse(args):
-    cases = parse_cases(Path(args.file))
-    print(json.dumps(cases, indent=2, ensure_ascii=False))
+    if not args.jsonl:
+        print(json.dumps(select_cases(args, "mostrar"), indent=2, ensure_ascii=False))
+        return
+    for case in iter_selected_cases(args, "mostrar"):
+        print(json.dumps(case, ensure_ascii=False), flush=True)
+
+
+def build_cache(args):
+    if args.no_cache:
+        return None
+    from src.cache import ContractCache
+
+    max_age = args.cache_max_age_days * 86400 if args.cache_max_age_days else None
+    return ContractCache(args.cache_dir, max_entries=args.cache_max_entries, max_age=max_age,
+                         wire_format=args.wire_format)
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignora la caché de contratos y consulta siempre a la IA.")
+    parser.add_argument("--cache-dir", default=".iatg_cache", help="Directorio de la caché de contratos.")
+    parser.add_argument("--cache-max-entries", type=int,
+                        help="Máximo de contratos en caché (elimina los más antiguos).")
+    parser.add_argument("--cache-max-age-days", type=float,
+                        help="Antigüedad máxima (días) de un contrato en caché.")
+
+
+def add_http_arguments(parser):
+    parser.add_argument("--http-pool-size", type=int, default=8,
+                        help="Conexiones keep-alive por host hacia la IA.")
+    parser.add_argument("--http-timeout", type=float,
+                        help="Timeout (segundos) de cada llamada HTTP a la IA.")
+    parser.add_argument("--http-gzip", action="store_true",
+                        help="Comprime con gzip las solicitudes y acepta respuestas gzip.")
+    parser.add_argument("--rpm", type=int, help="Límite de solicitudes por minuto hacia la IA.")
+    parser.add_argument("--tpm", type=int, help="Límite de tokens (estimados) por minuto hacia la IA.")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="Reintentos ante 429/5xx o errores de red (backoff exponencial con jitter).")
+
+
+def add_ai_arguments(parser):
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Solicitudes simultáneas a la IA (por defecto 1, secuencial).")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Casos por prompt al usar Gemini (por defecto 1, sin lotes).")
+    parser.add_argument("--batch-chars", type=int,
+                        help="Presupuesto de caracteres por prompt en modo lote (por defecto 12000).")
+    parser.add_argument("--stream", action="store_true",
+                        help="Recibe el contrato en streaming y valida cada sección al llegar.")
+    parser.add_argument("--wire-format", choices=["full", "compact"], default="full",
+                        help="Formato de respuesta pedido a Gemini; 'compact' usa una fila por paso y se expande localmente.")
+    parser.add_argument("--repair-attempts", type=int,
+                        help="Intentos de reparación por caso cuando el contrato no cumple el schema "
+                             "(solo Gemini, 2 por defecto).")
+    parser.add_argument("--step-level", action="store_true",
+                        help="Consulta a la IA solo los pasos únicos y arma los contratos localmente.")
+    parser.add_argument("--latency-budget", type=float,
+                        help="Segundos máximos de espera por contrato antes de duplicar la solicitud o usar el fallback.")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Al superar el presupuesto de latencia lanza una segunda solicitud y usa la primera respuesta.")
+    parser.add_argument("--fallback-local", action="store_true",
+                        help="Usa el stub local cuando la IA falla o no responde a tiempo (se marca en notes).")
+    parser.add_argument("--breaker-threshold", type=int, default=5,
+                        help="Fallos consecutivos que abren el circuito hacia la IA.")
+    parser.add_argument("--breaker-cooldown", type=float, default=60.0,
+                        help="Segundos que el circuito permanece abierto antes de reintentar.")
+    add_cache_arguments(parser)
+    add_http_arguments(parser)
+
+
+def build_fetch_options(args, cache):
+    from src.gemini_client import request_contract_repair
+    from src.pipeline import DEFAULT_BATCH_CHARS, FetchOptions, StepResolver
+    from src.repair import DEFAULT_REPAIR_ATTEMPTS, ContractRepairer
+
+    return FetchOptions(
+        service_url=args.service_url,
+        concurrency=args.concurrency,
+        cache=cache,
+        batch_size=args.batch_size,
+        batch_chars=args.batch_chars or DEFAULT_BATCH_CHARS,
+        stream=args.stream,
+        steps=StepResolver() if args.step_level else None,
+        fallback=build_fallback(args),
+        compact=args.wire_format == "compact",
+        repair=ContractRepairer(
+            DEFAULT_REPAIR_ATTEMPTS if args.repair_attempts is None else args.repair_attempts,
+            request=request_contract_repair if args.service_url == "gemini" else None,
+        ),
+    )
+
+
+def build_fallback(args):
+    if not (args.latency_budget or args.hedge or args.fallback_local):
+        return None
+    from src.fallback import CircuitBreaker, FallbackPolicy
+
+    return FallbackPolicy(
+        latency_budget=args.latency_budget,
+        hedge=args.hedge,
+        use_stub=args.fallback_local,
+        breaker=CircuitBreaker(args.breaker_threshold, args.breaker_cooldown),
+    )
+
+
+def configure_http(args):
+    from src.http_client import configure_pool
+    from src.scheduler import configure_scheduler
+
+    configure_pool(args.http_pool_size, timeout=args.http_timeout, gzip_enabled=args.http_gzip)
+    return configure_scheduler(
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.max_retries,
+        max_concurrency=args.concurrency * (2 if args.hedge else 1),
+    )
+
+
+def report_backend(scheduler, cache, options):
+    if options.repair.cases:
+        print(options.repair.summary())
+    if options.steps:
+        print(options.steps.summary())
+    if options.fallback:
+        print(options.fallback.summary())
+    print(scheduler.summary())
+    if cache:
+        cache.evict()
+        print(cache.summary())
+
+
+def ensure_all_valid(options):
+    if options.repair.failed():
+        raise ValueError(f"Contratos inválidos tras agotar las reparaciones: {options.repair.failure_report()}")
 
 
 def cmd_generate(args):
-    cases = parse_cases(Path(args.file))
-    if args.cases:
-        requested = {case_id.strip() for case_id in args.cases if case_id.strip()}
-        filtered = [case for case in cases if case.get("id") in requested]
-        missing = sorted(requested - {case.get("id") for case in filtered})
-        if missing:
-            raise ValueError(f"Casos no encontrados en {args.file}: {', '.join(missing)}")
-        if not filtered:
-            raise ValueError("No se seleccionó ningún caso válido para generar.")
-        cases = filtered
-    results = []
-    for case in cases:
-        contract = request_contract(case, args.service_url)
-        valid, errors = validate_contract(contract)
-        if not valid:
-            raise ValueError(f"Contrato inválido {case.get('id')}: {errors}")
-        results.append({"caseId": case.get("id"), "contract": contract})
-    save_contracts(results)
-    generate_artifacts([item["contract"] for item in results], Path(args.output))
-    print(f"Se generaron {len(results)} casos en {args.output}")
+    from src.archive import ArchiveWriter
+    from src.generator import ArtifactStream, OutlineIndex, PageIndex, StepIndex
+    from src.history import save_contracts
+    from src.manifest import ArtifactWriter
+    from src.pipeline import iter_contracts
+
+    if args.output_archive:
+        writer = ArchiveWriter(args.output_archive)
+    else:
+        writer = ArtifactWriter(args.output, incremental=not args.full_rewrite, prune=not (args.cases or args.tags))
+    catalog = CaseCatalog()
+    scheduler = configure_http(args)
+    cache = build_cache(args)
+    options = build_fetch_options(args, cache)
+    step_index = StepIndex() if args.shared_glue else None
+    page_index = PageIndex() if args.merge_pages else None
+    outline_index = OutlineIndex() if args.outlines else None
+    stream = ArtifactStream(writer.output_dir, writer, args.workers, step_index=step_index, page_index=page_index,
+                            outline_index=outline_index, parallel=args.parallel,
+                            reuse_browser=args.reuse_browser)
+    dropped = []
+    for case, contract in iter_contracts(iter_selected_cases(args, "generar", catalog), options):
+        if contract is None:
+            dropped.append(case.get("id"))
+            continue
+        save_contracts([{"caseId": case.get("id"), "contract": contract}])
+        stream.add(contract)
+    stream.finish()
+    if dropped and not args.output_archive:
+        writer.keep_stale()
+    writer.finish()
+    if catalog.files > 1:
+        print(catalog.summary())
+    print(f"Se generaron {stream.count} casos en {args.output_archive or args.output}")
+    print(writer.summary())
+    if outline_index is not None:
+        print(outline_index.summary())
+    if page_index is not None:
+        print(page_index.summary())
+        if args.page_map:
+            Path(args.page_map).write_text(json.dumps(page_index.report(), indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"Mapa de PageObjects guardado en {args.page_map}")
+    if step_index is not None:
+        print(step_index.summary())
+    if args.service_url != "local":
+        report_backend(scheduler, cache, options)
+    ensure_all_valid(options)
 
 
 def cmd_validate(args):
-    cases = parse_cases(Path(args.file))
-    if args.cases:
-        requested = {case_id.strip() for case_id in args.cases if case_id.strip()}
-        filtered = [case for case in cases if case.get("id") in requested]
-        missing = sorted(requested - {case.get("id") for case in filtered})
-        if missing:
-            raise ValueError(f"Casos no encontrados en {args.file}: {', '.join(missing)}")
-        if not filtered:
-            raise ValueError("No se seleccionó ningún caso válido para validar.")
-        cases = filtered
-    contracts = []
-    for case in cases:
-        contract = request_contract(case, args.service_url)
-        valid, errors = validate_contract(contract)
-        if not valid:
-            raise ValueError(f"Contrato inválido {case.get('id')}: {errors}")
-        contracts.append(contract)
+    from locator_validator import validate_locators
+    from src.pipeline import fetch_contracts
+
+    cases = select_cases(args, "validar")
+    scheduler = configure_http(args)
+    cache = build_cache(args)
+    options = build_fetch_options(args, cache)
+    contracts = fetch_contracts(cases, options)
+    if args.service_url != "local":
+        report_backend(scheduler, cache, options)
     validate_locators(
-        contracts,
+        [contract for contract in contracts if contract is not None],
         browser=args.browser,
         headless=not args.no_headless,
         timeout=args.timeout,
         remote_url=args.remote_url,
     )
+    ensure_all_valid(options)
+
+
+def cmd_harvest(args):
+    from locator_harvester import harvest_locators
+
+    harvest_locators(args, select_cases(args, "procesar"))
 
 
 def build_parser():
@@ -71,45 +258,62 @@ def build_parser():
     sub = parser.add_subparsers(dest="command", required=True)
 
     p_parse = sub.add_parser("parse", help="Parsea el archivo de casos")
-    p_parse.add_argument("file")
+    p_parse.add_argument("--jsonl", action="store_true",
+                         help="Emite un caso JSON por línea a medida que se leen (útil para archivos grandes).")
+    add_input_arguments(p_parse, "Muestra solo el caso con este ID. Repite esta bandera para múltiples valores.")
     p_parse.set_defaults(func=cmd_parse)
 
     p_generate = sub.add_parser("generate", help="Genera artefactos")
-    p_generate.add_argument("file")
     p_generate.add_argument("--output", default="generator/src")
     p_generate.add_argument("--service-url", default="local")
-    p_generate.add_argument(
-        "--case",
-        dest="cases",
-        action="append",
-        help="Filtra por ID de caso. Repite esta bandera para múltiples valores.",
-    )
+    p_generate.add_argument("--full-rewrite", action="store_true",
+                            help="Reescribe todos los artefactos aunque su contenido no haya cambiado.")
+    p_generate.add_argument("--shared-glue", action="store_true",
+                            help="Indexa los steps de todos los contratos y emite cada expresión una sola vez, "
+                                 "agrupada por PageObject, informando duplicados y ambigüedades.")
+    p_generate.add_argument("--parallel", type=int, default=0, metavar="HILOS",
+                            help="Genera Hooks con un WebDriver por hilo (ThreadLocal), un runner Cucumber TestNG "
+                                 "paralelo y parallel.gradle con HILOS hilos por defecto (0 = ejecución serial).")
+    p_generate.add_argument("--reuse-browser", type=int, default=0, metavar="ESCENARIOS",
+                            help="Reutiliza el navegador de cada hilo entre escenarios (limpia cookies, storage y "
+                                 "vuelve a about:blank) y lo recicla tras ESCENARIOS escenarios o tras un fallo "
+                                 "(0 = un navegador nuevo por escenario).")
+    p_generate.add_argument("--outlines", action="store_true",
+                            help="Agrupa en un Scenario Outline con tabla Examples los casos cuyos pasos solo difieren "
+                                 "en los valores entre comillas.")
+    p_generate.add_argument("--merge-pages", action="store_true",
+                            help="Fusiona los PageObjects por host/ruta de la URL y los campos con locator idéntico.")
+    p_generate.add_argument("--page-map", metavar="ARCHIVO",
+                            help="Con --merge-pages, guarda en JSON qué PageObjects y campos se fusionaron en cada clase.")
+    p_generate.add_argument("--output-archive", metavar="ARCHIVO",
+                            help="Genera los artefactos en memoria y los guarda en un solo .zip, .tar, .tar.gz o .tar.xz "
+                                 "en lugar de escribirlos en --output.")
+    add_input_arguments(p_generate, "Filtra por ID de caso. Repite esta bandera para múltiples valores.")
+    add_ai_arguments(p_generate)
     p_generate.set_defaults(func=cmd_generate)
 
     p_validate = sub.add_parser("validate", help="Valida los locators usando Selenium")
-    p_validate.add_argument("file")
     p_validate.add_argument("--service-url", default="local")
     p_validate.add_argument("--browser", choices=["chrome", "firefox", "edge"], default="chrome")
     p_validate.add_argument("--timeout", type=int, default=5, help="Timeout de búsqueda (segundos)")
-    p_validate.add_argument("--case", dest="cases", action="append",
-                            help="ID de caso a validar (repetir bandera para múltiples).")
+    add_input_arguments(p_validate, "ID de caso a validar (repetir bandera para múltiples).")
+    add_ai_arguments(p_validate)
     p_validate.add_argument("--no-headless", action="store_true", help="Ejecuta el navegador visible.")
     p_validate.add_argument("--remote-url", help="URL de Selenium Grid/Remote WebDriver (opcional).")
     p_validate.set_defaults(func=cmd_validate)
 
     p_harvest = sub.add_parser("harvest", help="Obtiene locators automáticamente con Selenium headless")
-    p_harvest.add_argument("file")
     p_harvest.add_argument("--output", default="locator_suggestions.json")
     p_harvest.add_argument("--browser", choices=["chrome", "firefox", "edge"], default="chrome")
     p_harvest.add_argument("--timeout", type=int, default=5, help="Timeout de búsqueda (segundos)")
-    p_harvest.add_argument("--case", dest="cases", action="append", help="ID de caso a procesar (repetible)")
+    add_input_arguments(p_harvest, "ID de caso a procesar (repetible)")
     p_harvest.add_argument("--no-headless", action="store_true", help="Ejecuta el navegador visible.")
     p_harvest.add_argument("--remote-url", help="URL de Selenium Grid/Remote WebDriver (opcional).")
     p_harvest.add_argument("--update-hints", action="store_true",
                            help="Actualiza el archivo ai/stub/locator_hints.json con los resultados.")
     p_harvest.add_argument("--hints-file", default="ai/stub/locator_hints.json",
                            help="Ruta del archivo de hints a actualizar.")
-    p_harvest.set_defaults(func=harvest_locators)
+    p_harvest.set_defaults(func=cmd_harvest)
 
     return parser
 
@@ -1,20 +1,29 @@
-import json
-import urllib.request
-
+from .compact import expand_compact, is_compact
+from .http_client import get_pool
+from .json_stream import decode_chunks, parse_contract_stream
 from .local_stub import build_contract
 from .gemini_client import request_contract_from_gemini
+from .scheduler import get_scheduler
+from .validator import contract_sections, validate_section
+
+
+def stream_http_contract(test_case, service_url):
+    chunks = get_pool().post_json_stream(service_url, test_case, timeout=30)
+    try:
+        return parse_contract_stream(decode_chunks(chunks), contract_sections(), validate_section)
+    finally:
+        chunks.close()
 
 
-def request_contract(test_case, service_url='local'):
+def request_contract(test_case, service_url='local', stream=False, compact=False):
     if service_url == 'local':
         return build_contract(test_case)
     if service_url == 'gemini':
-        return request_contract_from_gemini(test_case)
+        return request_contract_from_gemini(test_case, stream=stream, compact=compact)
     if service_url.startswith('http://') or service_url.startswith('https://'):
-        data = json.dumps(test_case).encode('utf-8')
-        req = urllib.request.Request(service_url, data=data, headers={'Content-Type': 'application/json'})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            if resp.status >= 400:
-                raise RuntimeError(f"IA service {resp.status}")
-            return json.loads(resp.read().decode('utf-8'))
+        if stream:
+            contract = get_scheduler().run(lambda: stream_http_contract(test_case, service_url))
+        else:
+            contract = get_scheduler().run(lambda: get_pool().post_json(service_url, test_case, timeout=30))
+        return expand_compact(contract, test_case) if is_compact(contract) else contract
     raise ValueError(f"Servicio IA no soportado: {service_url}")
@@ -0,0 +1,135 @@
+from pathlib import Path
+import io
+import os
+import tarfile
+import threading
+import time
+import weakref
+import zipfile
+
+ARCHIVE_FORMATS = (
+    ('.tar.gz', 'w:gz'),
+    ('.tgz', 'w:gz'),
+    ('.tar.xz', 'w:xz'),
+    ('.tar', 'w'),
+    ('.zip', 'zip'),
+)
+
+
+def archive_mode(path):
+    name = Path(path).name.lower()
+    for suffix, mode in ARCHIVE_FORMATS:
+        if name.endswith(suffix):
+            return mode
+    supported = ', '.join(suffix for suffix, _ in ARCHIVE_FORMATS)
+    raise ValueError(f"Formato de archivo no soportado para {path}. Usa una de estas extensiones: {supported}")
+
+
+def archive_mtime():
+    return int(os.getenv('SOURCE_DATE_EPOCH') or time.time())
+
+
+def open_archive(handle, mode):
+    if mode == 'zip':
+        return zipfile.ZipFile(handle, 'w', compression=zipfile.ZIP_DEFLATED)
+    return tarfile.open(fileobj=handle, mode=mode)
+
+
+def add_entry(archive, name, data, mtime):
+    if isinstance(archive, zipfile.ZipFile):
+        info = zipfile.ZipInfo(name, date_time=time.localtime(max(mtime, 315532800))[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        archive.writestr(info, data)
+        return
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = mtime
+    info.mode = 0o644
+    archive.addfile(info, io.BytesIO(data))
+
+
+def temporary_target(target):
+    return target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+
+def write_entries(entries, target, mtime=None):
+    target = Path(target)
+    mode = archive_mode(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temporary_target(target)
+    mtime = archive_mtime() if mtime is None else mtime
+    try:
+        with open(tmp, 'wb') as handle, open_archive(handle, mode) as archive:
+            for name, data in entries:
+                add_entry(archive, name, data, mtime)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read_entries(path, mode):
+    if mode == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                yield info.filename, archive.read(info)
+        return
+    with tarfile.open(path, 'r:*') as archive:
+        for member in archive:
+            yield member.name, archive.extractfile(member).read()
+
+
+def write_archive(tree, target):
+    write_entries(((name, tree[name].encode('utf-8')) for name in sorted(tree)), target)
+    return len(tree)
+
+
+def discard(archive, handle, tmp):
+    try:
+        archive.close()
+    finally:
+        handle.close()
+        tmp.unlink(missing_ok=True)
+
+
+class ArchiveWriter:
+    concurrent_writes = False
+
+    def __init__(self, target):
+        self.mode = archive_mode(target)
+        self.target = Path(target)
+        self.output_dir = self.target.parent / f".{self.target.name}"
+        self.names = set()
+        self.replaced = {}
+        self.mtime = archive_mtime()
+        self._lock = threading.Lock()
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp = self.target.with_name(f"{self.target.name}.{os.getpid()}.part")
+        self.handle = open(self.tmp, 'wb')
+        self.archive = open_archive(self.handle, self.mode)
+        self._discard = weakref.finalize(self, discard, self.archive, self.handle, self.tmp)
+
+    def write(self, path, content):
+        name = Path(path).relative_to(self.output_dir).as_posix()
+        data = content.encode('utf-8')
+        with self._lock:
+            if name in self.names:
+                self.replaced[name] = data
+                return
+            add_entry(self.archive, name, data, self.mtime)
+            self.names.add(name)
+
+    def finish(self):
+        with self._lock:
+            self.archive.close()
+            self.handle.close()
+            if self.replaced:
+                entries = ((name, self.replaced.get(name, data)) for name, data in read_entries(self.tmp, self.mode))
+                write_entries(entries, self.target, self.mtime)
+            else:
+                os.replace(self.tmp, self.target)
+            self._discard()
+        return len(self.names)
+
+    def summary(self):
+        return f"Artefactos: {len(self.names)} archivos en {self.target}"
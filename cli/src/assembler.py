@@ -0,0 +1,52 @@
+from urllib.parse import urlparse
+
+from .generator import normalize_step_text
+from .local_stub import module as stub
+
+INTERACTIONS = ('click', 'input', 'assertVisible', 'assertText')
+
+
+def step_host(url):
+    if not url:
+        return ''
+    return (urlparse(url).hostname or '').lower()
+
+
+def step_key(text, url):
+    return step_host(url), normalize_step_text(text)
+
+
+def describe_step_locally(text, idx, url):
+    params = stub.detect_parameters(text)
+    return {
+        'interaction': stub.detect_interaction(text, bool(params)),
+        'locator': stub.suggest_locator(text, idx, url),
+    }
+
+
+def normalize_step_info(info, text):
+    interaction = info.get('interaction')
+    if interaction not in INTERACTIONS:
+        interaction = stub.detect_interaction(text, bool(stub.detect_parameters(text)))
+    locator = info.get('locator') or {}
+    if not locator.get('value'):
+        raise ValueError(f"La IA no entregó un locator para el paso '{text}'")
+    return {
+        'interaction': interaction,
+        'locator': {key: locator[key] for key in ('strategy', 'value', 'confidence') if key in locator},
+    }
+
+
+def link_shared_steps(contract, registry):
+    for definition in contract.get('stepDefinitions', []):
+        key = stub.normalize_step(definition.get('stepText', ''))
+        shared = registry.setdefault(key, {'glue': definition['glueClass'], 'method': definition['methodName']})
+        if (shared['glue'], shared['method']) != (definition['glueClass'], definition['methodName']):
+            definition.update(glueClass=shared['glue'], methodName=shared['method'], reusesExisting=True)
+    return contract
+
+
+def assemble_contract(test_case, step_infos, registry):
+    url = test_case.get('url')
+    infos = [step_infos[step_key(text, url)] for text in test_case.get('steps', [])]
+    return stub.buildContract(test_case, infos, registry)
@@ -0,0 +1,137 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .gemini_client import DEFAULT_MODEL, PROMPT_VERSION
+from .validator import get_schema
+
+CACHE_DIR = Path('.iatg_cache')
+CASE_FIELDS = ('id', 'title', 'url', 'tags', 'steps')
+
+
+def normalize_case(test_case):
+    normalized = {}
+    for field in CASE_FIELDS:
+        value = test_case.get(field)
+        if isinstance(value, str):
+            value = ' '.join(value.split())
+        elif isinstance(value, list):
+            value = [' '.join(item.split()) if isinstance(item, str) else item for item in value]
+        normalized[field] = value
+    return normalized
+
+
+def backend_identity(service_url):
+    if service_url == 'gemini':
+        return f"gemini:{os.getenv('GEMINI_MODEL', DEFAULT_MODEL)}"
+    return service_url
+
+
+def schema_digest():
+    payload = json.dumps(get_schema(), sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class ContractCache:
+    def __init__(self, directory=CACHE_DIR, max_entries=None, max_age=None, wire_format='full'):
+        self.directory = Path(directory)
+        self.wire_format = wire_format
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._version = f"{PROMPT_VERSION}:{schema_digest()}"
+
+    def _digest(self, payload, service_url):
+        material = json.dumps(
+            dict(payload, backend=backend_identity(service_url), version=self._version),
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def key(self, test_case, service_url):
+        payload = {'case': normalize_case(test_case)}
+        if self.wire_format != 'full':
+            payload['wireFormat'] = self.wire_format
+        return self._digest(payload, service_url)
+
+    def step_key(self, host, normalized_step, service_url):
+        return self._digest({'host': host, 'step': normalized_step}, service_url)
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _expired(self, path, now):
+        return self.max_age is not None and now - path.stat().st_mtime > self.max_age
+
+    def _read(self, key, field):
+        path = self._path(key)
+        try:
+            if self._expired(path, time.time()):
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry.get(field)
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = dict(entry, key=key, version=self._version)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+
+    def get(self, test_case, service_url):
+        return self._read(self.key(test_case, service_url), 'contract')
+
+    def put(self, test_case, service_url, contract):
+        self._write(self.key(test_case, service_url), {
+            'caseId': test_case.get('id'),
+            'backend': backend_identity(service_url),
+            'contract': contract,
+        })
+
+    def get_step(self, host, normalized_step, service_url):
+        return self._read(self.step_key(host, normalized_step, service_url), 'step')
+
+    def put_step(self, host, normalized_step, service_url, info):
+        self._write(self.step_key(host, normalized_step, service_url), {
+            'host': host,
+            'backend': backend_identity(service_url),
+            'step': info,
+        })
+
+    def evict(self):
+        if not self.directory.exists():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.glob('*/*.json'):
+            if self._expired(path, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((path.stat().st_mtime, path))
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                path.unlink(missing_ok=True)
+                removed += 1
+        self.evicted += removed
+        return removed
+
+    def summary(self):
+        return f"Caché de contratos: {self.hits} aciertos, {self.misses} fallos, {self.evicted} eliminados"
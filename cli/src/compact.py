@@ -0,0 +1,80 @@
+from .assembler import assemble_contract, normalize_step_info, step_key
+
+COMPACT_COLUMNS = ('keyword', 'text', 'interaction', 'strategy', 'value', 'confidence')
+COMPACT_SECTIONS = ('caseId', 'title', 'url', 'tags', 'featureName', 'featureDescription', 'steps', 'notes')
+COMPACT_SPEC = (
+    "Contrato compacto esperado (una fila por paso, en orden):\n"
+    "{\n"
+    '  "caseId": string, "title": string, "url": string, "tags": [string],\n'
+    '  "featureName": string, "featureDescription": string,\n'
+    '  "steps": [ [keyword, texto del paso, interaction, strategy, locator, confidence] ],\n'
+    '  "notes": [string]\n'
+    "}\n"
+    'interaction: "click" | "input" | "assertVisible" | "assertText"; '
+    'strategy: "id|css|xpath|name"; confidence: número 0-1.\n'
+    "Las clases Java, los step definitions y los page objects se derivan localmente: no los incluyas.\n\n"
+)
+
+
+def is_compact(payload):
+    return isinstance(payload, dict) and 'steps' in payload and 'gherkin' not in payload
+
+
+def parse_row(row):
+    if isinstance(row, dict):
+        locator = row.get('locator') if isinstance(row.get('locator'), dict) else {}
+        row = [row.get('keyword'), row.get('text'), row.get('interaction'),
+               row.get('strategy') or locator.get('strategy'),
+               row.get('value') or locator.get('value'),
+               row.get('confidence', locator.get('confidence'))]
+    if not isinstance(row, list) or len(row) < 5 or not row[1]:
+        raise RuntimeError(f"Fila de contrato compacto inválida: {row}")
+    values = dict(zip(COMPACT_COLUMNS, row))
+    locator = {'strategy': values.get('strategy') or 'css', 'value': str(values.get('value') or '')}
+    if isinstance(values.get('confidence'), (int, float)):
+        locator['confidence'] = min(1, max(0, values['confidence']))
+    return {
+        'keyword': values.get('keyword') or 'When',
+        'text': str(values['text']),
+        'interaction': values.get('interaction'),
+        'locator': locator,
+    }
+
+
+def is_valid_row(row):
+    try:
+        parse_row(row)
+    except RuntimeError:
+        return False
+    return True
+
+
+def expand_compact(payload, test_case=None):
+    test_case = test_case or {}
+    rows = [parse_row(row) for row in payload.get('steps') or []]
+    if not rows:
+        raise RuntimeError("El contrato compacto no contiene pasos")
+    case = {
+        'id': payload.get('caseId') or test_case.get('id'),
+        'title': payload.get('title') or test_case.get('title'),
+        'url': payload.get('url') or test_case.get('url'),
+        'tags': payload.get('tags') if payload.get('tags') is not None else test_case.get('tags', []),
+        'steps': [row['text'] for row in rows],
+    }
+    infos = {}
+    for row in rows:
+        key = step_key(row['text'], case['url'])
+        if key in infos:
+            continue
+        try:
+            infos[key] = normalize_step_info(row, row['text'])
+        except ValueError as exc:
+            raise RuntimeError(str(exc)) from exc
+    contract = assemble_contract(case, infos, {})
+    gherkin = contract['gherkin']
+    gherkin['featureName'] = payload.get('featureName') or gherkin['featureName']
+    gherkin['featureDescription'] = payload.get('featureDescription') or gherkin['featureDescription']
+    for step, row in zip(gherkin['scenarios'][0]['steps'], rows):
+        step['keyword'] = row['keyword']
+    contract['notes'].extend(str(note) for note in payload.get('notes') or [])
+    return contract
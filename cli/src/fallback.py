@@ -0,0 +1,119 @@
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+from .http_client import request_deadline
+from .local_stub import build_contract
+
+FALLBACK_PREFIX = '[fallback]'
+FALLBACK_ERRORS = (RuntimeError, OSError)
+
+
+def is_fallback(contract):
+    return any(str(note).startswith(FALLBACK_PREFIX) for note in contract.get('notes') or [])
+
+
+def spawn(func, deadline=None):
+    future = Future()
+
+    def runner():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with request_deadline(deadline):
+                future.set_result(func())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=runner, daemon=True).start()
+    return future
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+                return True
+            return self.state == 'closed'
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = 'closed'
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half-open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = self._clock()
+
+
+class FallbackPolicy:
+    def __init__(self, latency_budget=None, hedge=False, use_stub=True, breaker=None):
+        self.latency_budget = latency_budget
+        self.hedge = hedge
+        self.use_stub = use_stub
+        self.breaker = breaker or CircuitBreaker()
+        self.fallbacks = 0
+        self.hedged = 0
+        self._lock = threading.Lock()
+
+    def fallback(self, case, reason, error=None):
+        if not self.use_stub:
+            if error:
+                raise error
+            raise RuntimeError(f"IA no disponible para {case.get('id')}: {reason}")
+        contract = build_contract(case)
+        contract.setdefault('notes', []).append(
+            f"{FALLBACK_PREFIX} Contrato generado por el stub local ({reason}); vuelve a solicitarlo a la IA."
+        )
+        with self._lock:
+            self.fallbacks += 1
+        return contract
+
+    def call(self, case, request):
+        if not self.breaker.allow():
+            return self.fallback(case, 'circuito abierto')
+        budget = self.latency_budget
+        deadline = None
+        if budget is not None and self.use_stub:
+            deadline = time.monotonic() + budget * (2 if self.hedge else 1)
+        done, pending = wait({spawn(request, deadline)}, timeout=budget)
+        if not done and self.hedge:
+            with self._lock:
+                self.hedged += 1
+            pending.add(spawn(request, time.monotonic() + budget))
+        error = None
+        while True:
+            for future in done:
+                try:
+                    contract = future.result()
+                except FALLBACK_ERRORS as exc:
+                    error = exc
+                    continue
+                self.breaker.record_success()
+                return contract
+            if not pending:
+                break
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                self.breaker.record_failure()
+                return self.fallback(case, f"sin respuesta en {budget:g}s")
+        self.breaker.record_failure()
+        return self.fallback(case, f"error de la IA: {error}", error)
+
+    def summary(self):
+        return (f"Fallback: {self.fallbacks} contratos del stub local, {self.hedged} solicitudes duplicadas, "
+                f"circuito {self.breaker.state}")
@@ -1,64 +1,169 @@
 import json
 import os
 import re
-import urllib.request
 
+from .compact import COMPACT_SECTIONS, COMPACT_SPEC, expand_compact, is_compact, is_valid_row
+from .http_client import get_pool
+from .json_repair import missing_sections, repair_json, salvage_contract
+from .json_stream import StreamIncomplete, parse_contract_stream
+from .scheduler import estimate_tokens, get_scheduler
 from .utils.strings import sanitize_json_text
+from .validator import contract_sections, required_sections, validate_section
 
 DEFAULT_MODEL = "gemini-pro"
 DEFAULT_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+DEFAULT_STREAM_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+PROMPT_VERSION = "1"
+MAX_OUTPUT_TOKENS = 2048
+MAX_BATCH_OUTPUT_TOKENS = 8192
+OUTPUT_TOKENS_PER_CONTRACT = 300
+OUTPUT_TOKENS_PER_STEP = 150
+COMPACT_OUTPUT_TOKENS_PER_CONTRACT = 100
+COMPACT_OUTPUT_TOKENS_PER_STEP = 40
 
 
-def build_prompt(test_case: dict) -> str:
+PROMPT_HEADER = (
+    "Eres un generador de contratos de automatización QA. "
+    "Debes responder EXCLUSIVAMENTE con un JSON válido que cumpla el esquema descrito. "
+    "No incluyas explicaciones fuera del JSON. "
+    "Si necesitas escribir código, hazlo dentro del JSON.\n\n"
+)
+CONTRACT_SPEC = (
+    "Contrato esperado:\n"
+    "{\n"
+    '  "meta": { "caseId": string, "title": string, "url": string, "tags": [string] },\n'
+    '  "gherkin": {\n'
+    '      "featureName": string,\n'
+    '      "featureDescription": string,\n'
+    '      "background": [string],\n'
+    '      "scenarios": [ { "name": string, "tags": [string], "steps": [ { "keyword": string, "text": string } ] } ]\n'
+    "  },\n"
+    '  "stepDefinitions": [ {\n'
+    '      "stepText": string,\n'
+    '      "glueClass": "com.autogen.steps.{caseId}Steps",\n'
+    '      "methodName": string,\n'
+    '      "parameters": ["String param1", ...],\n'
+    '      "action": {\n'
+    '          "pageObjectClass": "com.autogen.pages.{caseId}Page",\n'
+    '          "baseName": camelCase del paso,\n'
+    '          "interaction": "click" | "input" | "assertVisible" | "assertText"\n'
+    "      }\n"
+    "  } ],\n"
+    '  "pageObjects": [ {\n'
+    '      "className": "com.autogen.pages.{caseId}Page",\n'
+    '      "methods": [ {\n'
+    '          "name": camelCase del paso,\n'
+    '          "locator": { "strategy": "id|css|xpath|name", "value": string, "confidence": número 0-1 }\n'
+    "      } ]\n"
+    "  } ],\n"
+    '  "notes": [string]\n'
+    "}\n\n"
+)
+
+
+def describe_case(test_case: dict) -> str:
     title = test_case.get("title", "Caso sin título")
     case_id = test_case.get("id", "CASE-ID")
     url = test_case.get("url") or "N/A"
     tags = " ".join(test_case.get("tags", []))
     steps = "\n".join(f"- {step}" for step in test_case.get("steps", []))
-    template = (
-        "Eres un generador de contratos de automatización QA. "
-        "Debes responder EXCLUSIVAMENTE con un JSON válido que cumpla el esquema descrito. "
-        "No incluyas explicaciones fuera del JSON. "
-        "Si necesitas escribir código, hazlo dentro del JSON.\n\n"
-        "Contrato esperado:\n"
-        "{\n"
-        '  "meta": { "caseId": string, "title": string, "url": string, "tags": [string] },\n'
-        '  "gherkin": {\n'
-        '      "featureName": string,\n'
-        '      "featureDescription": string,\n'
-        '      "background": [string],\n'
-        '      "scenarios": [ { "name": string, "tags": [string], "steps": [ { "keyword": string, "text": string } ] } ]\n'
-        "  },\n"
-        '  "stepDefinitions": [ {\n'
-        '      "stepText": string,\n'
-        '      "glueClass": "com.autogen.steps.{caseId}Steps",\n'
-        '      "methodName": string,\n'
-        '      "parameters": ["String param1", ...],\n'
-        '      "action": {\n'
-        '          "pageObjectClass": "com.autogen.pages.{caseId}Page",\n'
-        '          "baseName": camelCase del paso,\n'
-        '          "interaction": "click" | "input" | "assertVisible" | "assertText"\n'
-        "      }\n"
-        "  } ],\n"
-        '  "pageObjects": [ {\n'
-        '      "className": "com.autogen.pages.{caseId}Page",\n'
-        '      "methods": [ {\n'
-        '          "name": camelCase del paso,\n'
-        '          "locator": { "strategy": "id|css|xpath|name", "value": string, "confidence": número 0-1 }\n'
-        "      } ]\n"
-        "  } ],\n"
-        '  "notes": [string]\n'
-        "}\n\n"
-        "Datos del caso:\n"
+    return (
         f"- caseId: {case_id}\n"
         f"- título: {title}\n"
         f"- url: {url}\n"
         f"- tags: {tags}\n"
         "Pasos:\n"
         f"{steps}\n"
-        "Responde únicamente con el JSON."
     )
-    return template
+
+
+def build_prompt(test_case: dict, compact: bool = False) -> str:
+    return (
+        PROMPT_HEADER
+        + (COMPACT_SPEC if compact else CONTRACT_SPEC)
+        + "Datos del caso:\n"
+        + describe_case(test_case)
+        + "Responde únicamente con el JSON."
+    )
+
+
+def build_batch_prompt(test_cases: list, compact: bool = False) -> str:
+    blocks = "\n".join(
+        f"Caso {idx + 1}:\n{describe_case(test_case)}" for idx, test_case in enumerate(test_cases)
+    )
+    case_id_field = "caseId" if compact else "meta.caseId"
+    return (
+        PROMPT_HEADER
+        + (COMPACT_SPEC if compact else CONTRACT_SPEC)
+        + f"Genera un contrato independiente para cada uno de los {len(test_cases)} casos siguientes. "
+        "Responde con un arreglo JSON de contratos, uno por caso, "
+        f"donde {case_id_field} coincida exactamente con el caseId del caso.\n\n"
+        + blocks
+        + "\nResponde únicamente con el arreglo JSON."
+    )
+
+
+STEP_SPEC = (
+    "Para cada paso responde un objeto con esta forma:\n"
+    "{\n"
+    '  "step": texto exacto del paso,\n'
+    '  "interaction": "click" | "input" | "assertVisible" | "assertText",\n'
+    '  "locator": { "strategy": "id|css|xpath|name", "value": string, "confidence": número 0-1 }\n'
+    "}\n\n"
+)
+
+
+def build_steps_prompt(url: str, steps: list) -> str:
+    listed = "\n".join(f"- {step}" for step in steps)
+    return (
+        PROMPT_HEADER
+        + "Necesitamos la interacción y el locator de pasos de prueba ya normalizados. "
+        "Los textos entre comillas son datos de ejemplo y no forman parte del locator.\n"
+        + STEP_SPEC
+        + f"URL de la página: {url or 'N/A'}\n"
+        "Pasos:\n"
+        f"{listed}\n"
+        "Responde únicamente con un arreglo JSON, un objeto por paso y en el mismo orden."
+    )
+
+
+def estimate_output_tokens(test_case: dict, compact: bool = False) -> int:
+    steps = len(test_case.get("steps") or [])
+    if compact:
+        return COMPACT_OUTPUT_TOKENS_PER_CONTRACT + COMPACT_OUTPUT_TOKENS_PER_STEP * steps
+    return OUTPUT_TOKENS_PER_CONTRACT + OUTPUT_TOKENS_PER_STEP * steps
+
+
+def plan_batches(test_cases: list, max_cases: int, max_chars: int, compact: bool = False) -> list:
+    batches = []
+    current = []
+    size = 0
+    output = 0
+    budget = max(0, max_chars - len(PROMPT_HEADER) - len(COMPACT_SPEC if compact else CONTRACT_SPEC))
+    for test_case in test_cases:
+        case_size = len(describe_case(test_case))
+        case_output = estimate_output_tokens(test_case, compact)
+        if current and (len(current) >= max_cases or size + case_size > budget
+                        or output + case_output > MAX_BATCH_OUTPUT_TOKENS):
+            batches.append(current)
+            current = []
+            size = 0
+            output = 0
+        current.append(test_case)
+        size += case_size
+        output += case_output
+    if current:
+        batches.append(current)
+    return batches
+
+
+def iter_response_text(payload: dict):
+    candidates = payload.get("candidates") or []
+    for candidate in candidates[:1]:
+        content = candidate.get("content") or {}
+        for part in content.get("parts") or []:
+            if "text" in part:
+                yield part["text"]
 
 
 def extract_text_from_response(payload: dict) -> str:
@@ -72,15 +177,32 @@ def extract_text_from_response(payload: dict) -> str:
     raise RuntimeError("Gemini no devolvió contenido utilizable")
 
 
-def call_gemini_api(prompt: str) -> dict:
+def iter_sse_text(chunks):
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data and data != b"[DONE]":
+                yield from iter_response_text(json.loads(data.decode("utf-8")))
+
+
+def gemini_url(endpoint_default: str, env_name: str, query: str = "") -> str:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY no está configurado")
     model = os.getenv("GEMINI_MODEL", DEFAULT_MODEL)
-    endpoint_tpl = os.getenv("GEMINI_API_URL", DEFAULT_ENDPOINT)
+    endpoint_tpl = os.getenv(env_name, endpoint_default)
     endpoint = endpoint_tpl.format(model=model)
-    url = f"{endpoint}?key={api_key}"
-    payload = {
+    return f"{endpoint}?{query}key={api_key}"
+
+
+def build_payload(prompt: str, max_output_tokens: int = MAX_OUTPUT_TOKENS) -> dict:
+    return {
         "contents": [
             {
                 "role": "user",
@@ -91,27 +213,190 @@ def call_gemini_api(prompt: str) -> dict:
             "temperature": 0.1,
             "topP": 0.9,
             "topK": 32,
-            "maxOutputTokens": 2048
+            "maxOutputTokens": max_output_tokens
         }
     }
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"}
+
+
+def call_gemini_api(prompt: str, max_output_tokens: int = MAX_OUTPUT_TOKENS) -> dict:
+    url = gemini_url(DEFAULT_ENDPOINT, "GEMINI_API_URL")
+    payload = build_payload(prompt, max_output_tokens)
+    return get_scheduler().run(
+        lambda: get_pool().post_json(url, payload, timeout=60),
+        tokens=estimate_tokens(prompt),
     )
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        if resp.status >= 400:
-            raise RuntimeError(f"Gemini API error {resp.status}")
-        return json.loads(resp.read().decode("utf-8"))
 
 
-def request_contract_from_gemini(test_case: dict) -> dict:
-    prompt = build_prompt(test_case)
+def stream_gemini_contract(prompt: str, compact: bool = False) -> dict:
+    url = gemini_url(DEFAULT_STREAM_ENDPOINT, "GEMINI_STREAM_API_URL", query="alt=sse&")
+    payload = build_payload(prompt)
+    sections, section_validator = (COMPACT_SECTIONS, None) if compact else (contract_sections(), validate_section)
+
+    def consume():
+        chunks = get_pool().post_json_stream(url, payload, timeout=60)
+        try:
+            return parse_contract_stream(iter_sse_text(chunks), sections, section_validator)
+        finally:
+            chunks.close()
+
+    return get_scheduler().run(consume, tokens=estimate_tokens(prompt))
+
+
+def parse_truncated_json(text: str, array: bool = False):
+    try:
+        payload, _ = repair_json(text, array=array)
+    except ValueError as exc:
+        raise RuntimeError(f"Gemini devolvió un JSON inválido: {exc}") from exc
+    if not isinstance(payload, list if array else dict):
+        raise RuntimeError("Gemini devolvió un JSON con un tipo inesperado")
+    return payload
+
+
+def parse_json_array(text: str) -> list:
+    try:
+        payload = json.loads(sanitize_json_text(text, array=True))
+    except json.JSONDecodeError:
+        payload = parse_truncated_json(text, array=True)
+    if not isinstance(payload, list):
+        raise RuntimeError("Gemini no devolvió un arreglo JSON")
+    return [item for item in payload if isinstance(item, dict)]
+
+
+def build_followup_prompt(test_case: dict, contract: dict, sections: list, uncovered: list, compact: bool) -> str:
+    received = ", ".join(contract) or "ninguna"
+    prompt = (
+        PROMPT_HEADER
+        + (COMPACT_SPEC if compact else CONTRACT_SPEC)
+        + "Caso de prueba:\n"
+        + describe_case(test_case)
+        + f"\nLa respuesta anterior se cortó. Ya recibimos estas secciones completas: {received}.\n"
+    )
+    if uncovered:
+        listed = "\n".join(f"- {step}" for step in uncovered)
+        target = "filas de steps" if compact else "stepDefinitions"
+        prompt += f"Genera {target} solo para estos pasos, en orden:\n{listed}\n"
+    if "pageObjects" in sections and contract.get("stepDefinitions"):
+        names = ", ".join(
+            (definition.get("action") or {}).get("baseName", "") for definition in contract["stepDefinitions"]
+        )
+        prompt += f"Los métodos de pageObjects deben llamarse como los baseName ya recibidos: {names}.\n"
+    return prompt + f"Responde únicamente con un objeto JSON que contenga solo estas secciones: {', '.join(sections)}."
+
+
+def request_missing_sections(test_case: dict, contract: dict, missing: list, uncovered: list, compact: bool) -> dict:
+    partial_section = "steps" if compact else "stepDefinitions"
+    sections = list(missing)
+    if uncovered and partial_section not in sections:
+        sections.append(partial_section)
+    prompt = build_followup_prompt(test_case, contract, sections, uncovered, compact)
+    response = call_gemini_api(prompt)
+    received = parse_truncated_json(extract_text_from_response(response))
+    merged = dict(contract)
+    for name in sections:
+        value = received.get(name)
+        if value is None:
+            continue
+        if name == partial_section and uncovered and isinstance(value, list):
+            merged[name] = list(contract.get(name) or []) + value
+        else:
+            merged[name] = value
+    return merged
+
+
+def complete_contract(test_case: dict, contract: dict, compact: bool = False) -> dict:
+    if compact:
+        rows = [row for row in contract.get("steps") or [] if is_valid_row(row)]
+        contract = dict(contract, steps=rows)
+        missing, uncovered = [], list(test_case.get("steps", []))[len(rows):]
+    else:
+        contract = salvage_contract(contract, contract_sections(), validate_section)
+        missing, uncovered = missing_sections(test_case, contract, required_sections())
+    if not missing and not uncovered:
+        return contract
+    return request_missing_sections(test_case, contract, missing, uncovered, compact)
+
+
+def build_repair_prompt(test_case: dict, current: dict, errors: list, sections: list) -> str:
+    listed = "\n".join(f"- {path or '/'}: {message}" for path, message in errors)
+    return (
+        PROMPT_HEADER
+        + CONTRACT_SPEC
+        + "Caso de prueba:\n"
+        + describe_case(test_case)
+        + "\nEl contrato que generaste no cumple el schema. Errores (ruta JSON: mensaje):\n"
+        + f"{listed}\n"
+        + "Secciones actuales con errores:\n"
+        + json.dumps(current, ensure_ascii=False)
+        + f"\nCorrige solo esos errores y responde únicamente con un objeto JSON que contenga estas secciones: "
+        f"{', '.join(sections)}."
+    )
+
+
+def request_contract_repair(test_case: dict, current: dict, errors: list, sections: list) -> dict:
+    prompt = build_repair_prompt(test_case, current, errors, sections)
     response = call_gemini_api(prompt)
     text = extract_text_from_response(response)
-    cleaned = sanitize_json_text(text)
     try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Gemini devolvió un JSON inválido: {exc}") from exc
+        return json.loads(sanitize_json_text(text))
+    except json.JSONDecodeError:
+        return parse_truncated_json(text)
+
+
+def request_contract_from_gemini(test_case: dict, stream: bool = False, compact: bool = False) -> dict:
+    prompt = build_prompt(test_case, compact)
+    if stream:
+        try:
+            contract = stream_gemini_contract(prompt, compact)
+        except StreamIncomplete as exc:
+            contract = complete_contract(test_case, exc.partial, compact)
+    else:
+        response = call_gemini_api(prompt)
+        text = extract_text_from_response(response)
+        try:
+            contract = json.loads(sanitize_json_text(text))
+        except json.JSONDecodeError:
+            contract = complete_contract(test_case, parse_truncated_json(text), compact)
+    return expand_compact(contract, test_case) if is_compact(contract) else contract
+
+
+def split_batch_response(text: str, test_cases: list = ()) -> dict:
+    first_array = text.find("[")
+    first_object = text.find("{")
+    as_array = first_array != -1 and (first_object == -1 or first_array < first_object)
+    try:
+        payload = json.loads(sanitize_json_text(text, array=as_array))
+    except json.JSONDecodeError:
+        try:
+            payload, _ = repair_json(text, array=as_array)
+        except ValueError:
+            return {}
+    if isinstance(payload, dict):
+        payload = payload.get("contracts") or [payload]
+    cases_by_id = {test_case.get("id"): test_case for test_case in test_cases}
+    contracts = {}
+    for contract in payload if isinstance(payload, list) else []:
+        if not isinstance(contract, dict):
+            continue
+        if is_compact(contract):
+            case_id = contract.get("caseId")
+            try:
+                contract = expand_compact(contract, cases_by_id.get(case_id))
+            except RuntimeError:
+                continue
+        case_id = (contract.get("meta") or {}).get("caseId")
+        if case_id and case_id not in contracts:
+            contracts[case_id] = contract
+    return contracts
+
+
+def request_contracts_from_gemini_batch(test_cases: list, compact: bool = False) -> dict:
+    prompt = build_batch_prompt(test_cases, compact)
+    max_tokens = min(MAX_OUTPUT_TOKENS * len(test_cases), MAX_BATCH_OUTPUT_TOKENS)
+    response = call_gemini_api(prompt, max_output_tokens=max_tokens)
+    return split_batch_response(extract_text_from_response(response), test_cases)
+
+
+def request_step_infos_from_gemini(url: str, steps: list) -> list:
+    prompt = build_steps_prompt(url, steps)
+    response = call_gemini_api(prompt)
+    return parse_json_array(extract_text_from_response(response))
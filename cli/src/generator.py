@@ -1,6 +1,10 @@
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
+import os
 import re
 from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
 
 from .utils.strings import slugify, camel_case, extract_url
 
@@ -8,6 +12,21 @@ STEP_PACKAGE = 'com.autogen.steps'
 PAGE_PACKAGE = 'com.autogen.pages'
 HOOKS_PACKAGE = 'com.autogen.hooks'
 RUNNER_PACKAGE = 'com.autogen.runners'
+SHARED_GLUE_CLASS = f'{STEP_PACKAGE}.SharedSteps'
+MAX_REPORTED_AMBIGUITIES = 20
+MAX_REPORTED_PAGES = 20
+LITERAL_PATTERN = re.compile(r'"([^"]*)"')
+JAVA_DIR = Path('test/java')
+FEATURE_DIR = Path('test/resources/features')
+PARALLEL_RENDER_MIN_JOBS = 64
+RENDER_CHUNK_JOBS = 32
+STREAM_RENDER_JOBS = 512
+GLUE_STEP_FIELDS = ('stepText', 'methodName', 'parameters', 'reusesExisting')
+GLUE_ACTION_FIELDS = ('pageObjectClass', 'baseName', 'interaction')
+TEXT_CACHE_SIZE = 65536
+WRITE_THREADS = 8
+CUCUMBER_VERSION = '7.18.1'
+PARALLEL_SETTINGS = Path('parallel.gradle')
 Contract = Dict[str, Any]
 
 
@@ -31,12 +50,17 @@ PARAM_HINTS = [
 ]
 
 
-def guess_parameter_name(step_text: str, idx: int) -> str:
-    lower = (step_text or '').lower()
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def parameter_hint(step_text: str):
+    lower = step_text.lower()
     for keywords, name in PARAM_HINTS:
         if any(keyword in lower for keyword in keywords):
             return name
-    return f"valor{idx + 1}"
+    return None
+
+
+def guess_parameter_name(step_text: str, idx: int) -> str:
+    return parameter_hint(step_text or '') or f"valor{idx + 1}"
 
 
 def sanitize_identifier(name: str) -> str:
@@ -102,7 +126,10 @@ def indent(body: str, spaces: int = 8) -> str:
     return '\n'.join(f"{pad}{line.rstrip()}" for line in body.split('\n'))
 
 
-def write_file(path: Path, content: str):
+def write_file(path: Path, content: str, writer=None):
+    if writer is not None:
+        writer.write(path, content)
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content, encoding='utf-8')
 
@@ -132,14 +159,133 @@ def render_feature(contract, index):
     return '\n'.join(lines)
 
 
-def write_features(contracts, output_dir):
-    feature_dir = Path(output_dir) / 'test/resources/features'
-    feature_dir.mkdir(parents=True, exist_ok=True)
-    for idx, contract in enumerate(contracts):
+def render_feature_file(idx, contract):
+    meta = contract.get('meta', {})
+    preferred_name = meta.get('title') or meta.get('caseId') or f"feature-{idx + 1}"
+    slug = slugify(preferred_name) or f"feature-{idx + 1}"
+    return FEATURE_DIR / f"{slug}.feature", render_feature(contract, idx)
+
+
+def outline_template(text):
+    values = LITERAL_PATTERN.findall(text)
+    parts = LITERAL_PATTERN.split(text)[::2]
+    return tuple(parts), values
+
+
+def escape_cell(value):
+    return str(value).replace('\\', '\\\\').replace('|', '\\|').replace('\n', '\\n')
+
+
+def render_table(header, rows):
+    return [f"      | {' | '.join(escape_cell(cell) for cell in row)} |" for row in [header, *rows]]
+
+
+def render_outline_file(group):
+    first = group['rows'][0]
+    columns = []
+    used = {'caso'}
+    for position, (step_idx, literal_idx) in enumerate(group['slots']):
+        if len({row['values'][position] for row in group['rows']}) == 1:
+            columns.append(None)
+            continue
+        text = group['texts'][step_idx]
+        base = sanitize_identifier(guess_parameter_name(text, literal_idx)) or f"valor{position + 1}"
+        name, counter = base, 1
+        while name in used:
+            name = f"{base}{counter}"
+            counter += 1
+        used.add(name)
+        columns.append(name)
+    rows = group['rows']
+    shared = all(row['featureName'] == first['featureName'] for row in rows)
+    feature_name = first['featureName'] if shared else f"{first['featureName']} y {len(rows) - 1} casos más"
+    lines = [f"Feature: {feature_name}"]
+    if shared and first['featureDescription']:
+        lines.append(f"  {first['featureDescription']}")
+    lines.extend(['', '  Scenario Outline: <caso>'])
+    keyword_flow = compute_step_keywords(len(group['templates']))
+    position = 0
+    for idx, parts in enumerate(group['templates']):
+        text = parts[0]
+        for part in parts[1:]:
+            column = columns[position]
+            value = f"<{column}>" if column else first['values'][position]
+            text += f'"{value}"{part}'
+            position += 1
+        lines.append(f"    {keyword_flow[idx]} {text}")
+    header = ['caso', *(column for column in columns if column)]
+    by_tags = {}
+    for row in group['rows']:
+        by_tags.setdefault(tuple(row['tags']), []).append(row)
+    for tags, rows in by_tags.items():
+        lines.append('')
+        if tags:
+            lines.append('    ' + ' '.join(tags))
+        lines.append('    Examples:')
+        lines.extend(render_table(header, [[row['name'], *(value for value, column in zip(row['values'], columns)
+                                                           if column)] for row in rows]))
+    lines.append('')
+    return FEATURE_DIR / f"{first['slug']}.feature", '\n'.join(lines)
+
+
+class OutlineIndex:
+    def __init__(self):
+        self.groups = {}
+        self.cases = 0
+
+    def add(self, idx, contract):
+        gherkin = contract.get('gherkin', {})
+        scenarios = gherkin.get('scenarios', [])
+        if len(scenarios) != 1 or gherkin.get('background'):
+            return False
+        scenario = scenarios[0]
+        texts = [step.get('text', '') for step in scenario.get('steps', [])]
+        if not texts or any('<' in text for text in texts):
+            return False
+        templates, values, slots = [], [], []
+        for step_idx, text in enumerate(texts):
+            parts, literals = outline_template(text)
+            templates.append(parts)
+            values.extend(literals)
+            slots.extend((step_idx, literal_idx) for literal_idx in range(len(literals)))
+        skeleton = tuple(normalize_step_text(text) for text in texts)
+        group = self.groups.setdefault((skeleton, tuple(templates)),
+                                       {'templates': templates, 'texts': texts, 'slots': slots, 'rows': []})
         meta = contract.get('meta', {})
         preferred_name = meta.get('title') or meta.get('caseId') or f"feature-{idx + 1}"
-        slug = slugify(preferred_name) or f"feature-{idx + 1}"
-        write_file(feature_dir / f"{slug}.feature", render_feature(contract, idx))
+        group['rows'].append({
+            'index': idx,
+            'slug': slugify(preferred_name) or f"feature-{idx + 1}",
+            'meta': {'title': meta.get('title'), 'caseId': meta.get('caseId')},
+            'featureName': gherkin.get('featureName') or meta.get('title'),
+            'featureDescription': gherkin.get('featureDescription'),
+            'name': scenario.get('name', f'Escenario {idx + 1}'),
+            'tags': scenario.get('tags') or [],
+            'values': values,
+            'texts': texts,
+        })
+        self.cases += 1
+        return True
+
+    def jobs(self):
+        jobs = []
+        for group in self.groups.values():
+            if len(group['rows']) > 1:
+                jobs.append((render_outline_file, (group,)))
+                continue
+            row = group['rows'][0]
+            contract = {'meta': row['meta'], 'gherkin': {
+                'featureName': row['featureName'], 'featureDescription': row['featureDescription'],
+                'scenarios': [{'name': row['name'], 'tags': row['tags'], 'steps': [{'text': text} for text in row['texts']]}],
+            }}
+            jobs.append((render_feature_file, (row['index'], contract)))
+        return jobs
+
+    def summary(self):
+        outlines = [group for group in self.groups.values() if len(group['rows']) > 1]
+        merged = sum(len(group['rows']) for group in outlines)
+        return (f"Scenario Outlines: {merged} de {self.cases} casos agrupados en {len(outlines)} outlines "
+                f"({merged - len(outlines)} features menos)")
 
 
 ### Step Definitions
@@ -154,7 +300,7 @@ NAVIGATION_KEYWORDS = (
 )
 
 
-def build_step_body(step, page_infos, param_names):
+def build_step_body(step, page_index, param_names):
     action = step.get('action') or {}
     po_class = action.get('pageObjectClass')
     base_name = camel_case(action.get('baseName', 'element'))
@@ -171,7 +317,7 @@ def build_step_body(step, page_infos, param_names):
             return f'driver.get("{target_url}");'
     if not po_class:
         return '// TODO'
-    target = next((info for info in page_infos if info['fqcn'] == po_class), None)
+    target = page_index.get(po_class)
     if not target:
         return '// TODO'
     interaction = (action.get('interaction') or 'click').lower()
@@ -184,6 +330,7 @@ def build_step_body(step, page_infos, param_names):
     return f"{target['var']}.{base_name}Click();"
 
 
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
 def normalize_step_text(text: str) -> str:
     if not text:
         return ''
@@ -204,92 +351,176 @@ def build_step_metadata(contract):
             normalized = normalize_step_text(text)
             keyword = keyword_flow[idx] if idx < len(keyword_flow) else step.get('keyword', 'When')
             keyword_map.setdefault(normalized, keyword)
-            text_map.setdefault(normalized, []).append(text)
+            text_map.setdefault(normalized, deque()).append(text)
     return keyword_map, text_map
 
 
+def compact_glue_step(step):
+    compact = {field: step[field] for field in GLUE_STEP_FIELDS if field in step}
+    action = step.get('action')
+    if isinstance(action, dict):
+        compact['action'] = {field: action[field] for field in GLUE_ACTION_FIELDS if field in action}
+    return compact
+
+
+def add_glue_data(glue_map, contract):
+    keyword_map, text_map = build_step_metadata(contract)
+    meta_url = contract.get('meta', {}).get('url')
+    for step in contract.get('stepDefinitions', []):
+        glue = step.get('glueClass') or STEP_PACKAGE
+        entry = glue_map.setdefault(glue, {'steps': [], 'pages': {}})
+        enriched = compact_glue_step(step)
+        normalized = normalize_step_text(step.get('stepText'))
+        enriched['_keyword'] = keyword_map.get(normalized, 'When')
+        enriched['_meta_url'] = meta_url
+        texts = text_map.get(normalized) or []
+        enriched['_gherkin_text'] = texts.popleft() if texts else step.get('stepText')
+        entry['steps'].append(enriched)
+        po_class = step.get('action', {}).get('pageObjectClass')
+        if po_class:
+            entry['pages'][po_class] = True
+
+
 def collect_glue_data(contracts):
     glue_map = {}
     for contract in contracts:
-        keyword_map, text_map = build_step_metadata(contract)
-        meta_url = contract.get('meta', {}).get('url')
-        for step in contract.get('stepDefinitions', []):
-            glue = step.get('glueClass') or STEP_PACKAGE
-            entry = glue_map.setdefault(glue, {'steps': [], 'pages': set()})
-            enriched = dict(step)
-            normalized = normalize_step_text(step.get('stepText'))
-            enriched['_keyword'] = keyword_map.get(normalized, 'When')
-            enriched['_meta_url'] = meta_url
-            texts = text_map.get(normalized) or []
-            enriched['_gherkin_text'] = texts.pop(0) if texts else step.get('stepText')
-            entry['steps'].append(enriched)
-            po_class = step.get('action', {}).get('pageObjectClass')
-            if po_class:
-                entry['pages'].add(po_class)
+        add_glue_data(glue_map, contract)
     return glue_map
 
 
-def write_step_classes(contracts, output_dir):
-    base_dir = Path(output_dir) / 'test/java'
-    glue_map = collect_glue_data(contracts)
-    for glue, data in glue_map.items():
-        method_names = set()
-        package_parts = glue.split('.')
-        package = '.'.join(package_parts[:-1])
-        class_name = package_parts[-1]
-        dir_path = base_dir / '/'.join(package_parts[:-1])
-        dir_path.mkdir(parents=True, exist_ok=True)
-
-        imports = {
-            'io.cucumber.java.en.*',
-            'org.openqa.selenium.WebDriver',
-            f'{HOOKS_PACKAGE}.Hooks'
-        }
-        page_infos = []
-        for fqcn in data['pages']:
-            parts = fqcn.split('.')
-            info = {'fqcn': fqcn, 'class': parts[-1], 'var': camel_case(parts[-1])}
-            page_infos.append(info)
-            imports.add(fqcn)
-        if any(step.get('action', {}).get('interaction', '').lower().startswith('assert') for step in data['steps']):
-            imports.add('org.testng.Assert')
-
-        methods = []
-        for idx, step in enumerate(data['steps']):
-            annotation = (step.get('_keyword') or 'When').capitalize()
-            text = step.get('_gherkin_text') or step.get('stepText') or ''
-            expression = to_cucumber_expression(text)
-            param_defs, param_names = build_method_parameters(step, text)
-            params = ', '.join(param_defs)
-            body = build_step_body(step, page_infos, param_names)
-            cleaned_text = remove_parameter_literals(text) or text
-            base_name = camel_case(cleaned_text or f"step{idx + 1}") or f"step{idx + 1}"
-            reuse_existing = step.get('reusesExisting')
-            preferred = step.get('methodName') if reuse_existing else None
-            if not preferred:
-                preferred = base_name
-            name_candidate = preferred
-            counter = 1
-            if preferred in method_names and step.get('methodName'):
-                continue
-            while name_candidate in method_names:
-                name_candidate = f"{preferred}{counter}"
-                counter += 1
-            method_names.add(name_candidate)
-            method_lines = [f"    @{annotation}(\"{expression}\")",
-                            f"    public void {name_candidate}({params}) {{" if params else f"    public void {name_candidate}() {{",
-                            indent(body if body else '// TODO'),
-                            '    }']
-            methods.append('\n'.join(method_lines))
+def page_info(fqcn):
+    class_name = fqcn.split('.')[-1]
+    return {'fqcn': fqcn, 'class': class_name, 'var': camel_case(class_name)}
+
+
+def shared_glue_class(po_class):
+    if not po_class:
+        return SHARED_GLUE_CLASS
+    class_name = po_class.split('.')[-1]
+    base = class_name[:-len('Page')] if class_name.endswith('Page') and class_name != 'Page' else class_name
+    return f"{STEP_PACKAGE}.{base}Steps"
+
+
+def step_implementation(step, text):
+    param_defs, param_names = build_method_parameters(step, text)
+    po_class = (step.get('action') or {}).get('pageObjectClass')
+    page_index = {po_class: page_info(po_class)} if po_class else {}
+    return tuple(param_defs), build_step_body(step, page_index, param_names)
+
+
+class StepIndex:
+    def __init__(self):
+        self.glue_map = {}
+        self.index = {}
+        self.expressions = {}
+        self.total = 0
+        self.duplicates = 0
+        self.conflicts = []
+        self.variants = []
+
+    def add(self, contract):
+        case_id = contract.get('meta', {}).get('caseId')
+        staging = {}
+        add_glue_data(staging, contract)
+        for data in staging.values():
+            for step in data['steps']:
+                self.add_step(step, case_id)
+
+    def add_step(self, step, case_id):
+        self.total += 1
+        text = step.get('_gherkin_text') or step.get('stepText') or ''
+        expression = to_cucumber_expression(text)
+        implementation = step_implementation(step, text)
+        known = self.expressions.get(expression)
+        if known is not None:
+            if known[0] == implementation:
+                self.duplicates += 1
+            else:
+                self.conflicts.append((expression, known[1], case_id))
+            return
+        group = self.index.setdefault(normalize_step_text(step.get('stepText')), {})
+        differing = next((owner for impl, owner in group.values() if impl != implementation), None)
+        if differing is not None:
+            self.variants.append((expression, differing, case_id))
+        group[expression] = self.expressions[expression] = (implementation, case_id)
+        po_class = (step.get('action') or {}).get('pageObjectClass')
+        entry = self.glue_map.setdefault(shared_glue_class(po_class), {'steps': [], 'pages': {}})
+        shared = dict(step)
+        shared.pop('reusesExisting', None)
+        entry['steps'].append(shared)
+        if po_class:
+            entry['pages'][po_class] = True
+
+    def summary(self):
+        emitted = len(self.expressions)
+        lines = [f"Glue compartido: {self.total} step definitions -> {emitted} métodos en {len(self.glue_map)} clases "
+                 f"({self.duplicates} duplicados eliminados, {len(self.conflicts)} conflictos, "
+                 f"{len(self.variants)} variantes ambiguas)"]
+        details = [f"  - Conflicto en \"{expression}\": {other} lo implementa distinto que {first}; se conserva {first}"
+                   for expression, first, other in self.conflicts]
+        details.extend(f"  - Ambiguo \"{expression}\": {other} y {first} normalizan igual pero hacen cosas distintas"
+                       for expression, first, other in self.variants)
+        lines.extend(details[:MAX_REPORTED_AMBIGUITIES])
+        if len(details) > MAX_REPORTED_AMBIGUITIES:
+            lines.append(f"  ... y {len(details) - MAX_REPORTED_AMBIGUITIES} más")
+        return '\n'.join(lines)
+
+
+def render_step_class(glue, data):
+    method_names = set()
+    package_parts = glue.split('.')
+    package = '.'.join(package_parts[:-1])
+    class_name = package_parts[-1]
+
+    imports = {
+        'io.cucumber.java.en.*',
+        'org.openqa.selenium.WebDriver',
+        f'{HOOKS_PACKAGE}.Hooks'
+    }
+    page_infos = []
+    for fqcn in data['pages']:
+        page_infos.append(page_info(fqcn))
+        imports.add(fqcn)
+    page_index = {info['fqcn']: info for info in page_infos}
+    if any(step.get('action', {}).get('interaction', '').lower().startswith('assert') for step in data['steps']):
+        imports.add('org.testng.Assert')
+
+    methods = []
+    for idx, step in enumerate(data['steps']):
+        annotation = (step.get('_keyword') or 'When').capitalize()
+        text = step.get('_gherkin_text') or step.get('stepText') or ''
+        expression = to_cucumber_expression(text)
+        param_defs, param_names = build_method_parameters(step, text)
+        params = ', '.join(param_defs)
+        body = build_step_body(step, page_index, param_names)
+        cleaned_text = remove_parameter_literals(text) or text
+        base_name = camel_case(cleaned_text or f"step{idx + 1}") or f"step{idx + 1}"
+        reuse_existing = step.get('reusesExisting')
+        preferred = step.get('methodName') if reuse_existing else None
+        if not preferred:
+            preferred = base_name
+        name_candidate = preferred
+        counter = 1
+        if preferred in method_names and step.get('methodName'):
+            continue
+        while name_candidate in method_names:
+            name_candidate = f"{preferred}{counter}"
+            counter += 1
+        method_names.add(name_candidate)
+        method_lines = [f"    @{annotation}(\"{expression}\")",
+                        f"    public void {name_candidate}({params}) {{" if params else f"    public void {name_candidate}() {{",
+                        indent(body if body else '// TODO'),
+                        '    }']
+        methods.append('\n'.join(method_lines))
 
-        import_block = '\n'.join(f'import {imp};' for imp in sorted(imports))
-        field_lines = ['    private final WebDriver driver;'] + [f"    private final {info['class']} {info['var']};" for info in page_infos]
-        ctor_lines = ['    public {0}() {{'.format(class_name), '        this.driver = Hooks.getDriver();']
-        ctor_lines.extend(f"        this.{info['var']} = new {info['class']}(this.driver);" for info in page_infos)
-        ctor_lines.append('    }')
+    import_block = '\n'.join(f'import {imp};' for imp in sorted(imports))
+    field_lines = ['    private final WebDriver driver;'] + [f"    private final {info['class']} {info['var']};" for info in page_infos]
+    ctor_lines = ['    public {0}() {{'.format(class_name), '        this.driver = Hooks.getDriver();']
+    ctor_lines.extend(f"        this.{info['var']} = new {info['class']}(this.driver);" for info in page_infos)
+    ctor_lines.append('    }')
 
-        class_lines = [f"package {package};", '', import_block, '', f"public class {class_name} {{", *field_lines, '', *ctor_lines, '', '\n\n'.join(methods), '}']
-        write_file(dir_path / f"{class_name}.java", '\n'.join(class_lines))
+    class_lines = [f"package {package};", '', import_block, '', f"public class {class_name} {{", *field_lines, '', *ctor_lines, '', '\n\n'.join(methods), '}']
+    return JAVA_DIR / '/'.join(package_parts[:-1]) / f"{class_name}.java", '\n'.join(class_lines)
 
 
 ### Page Objects
@@ -336,48 +567,153 @@ def build_element_blocks(methods):
     return blocks
 
 
-def write_page_objects(contracts, output_dir):
-    base_dir = Path(output_dir) / 'test/java'
-    for contract in contracts:
-        for po in contract.get('pageObjects', []):
-            package_parts = po['className'].split('.')
-            package = '.'.join(package_parts[:-1])
-            class_name = package_parts[-1]
-            dir_path = base_dir / '/'.join(package_parts[:-1])
-            dir_path.mkdir(parents=True, exist_ok=True)
-            blocks = build_element_blocks(po.get('methods'))
-            class_lines = [f"package {package};", '',
-             'import org.openqa.selenium.WebDriver;',
-             'import org.openqa.selenium.WebElement;',
-             'import org.openqa.selenium.interactions.Actions;',
-             'import org.openqa.selenium.JavascriptExecutor;',
-                           'import org.openqa.selenium.support.FindBy;',
-                           'import org.openqa.selenium.support.PageFactory;',
-                           '',
-                           f"public class {class_name} extends WebBasePage {{",
-                           '    private static WebDriver driver;',
-                           '']
-            if blocks:
-                for block in blocks:
-                    class_lines.append(block['field'])
-                    class_lines.append('')
-            class_lines.extend([
-                f"    public {class_name}(WebDriver driver) {{",
-                '        super(driver);',
-                f"        {class_name}.driver = driver;",
-                '        PageFactory.initElements(driver, this);',
-                '    }',
-                ''
-            ])
-            for block in blocks:
-                class_lines.append(block['actions'])
-                class_lines.append('')
-            class_lines.append('}')
-            write_file(dir_path / f"{class_name}.java", '\n'.join(class_lines))
-
-
-def write_base_page(output_dir):
-    dir_path = Path(output_dir) / 'test/java' / '/'.join(PAGE_PACKAGE.split('.'))
+def render_page_object(po):
+    package_parts = po['className'].split('.')
+    package = '.'.join(package_parts[:-1])
+    class_name = package_parts[-1]
+    blocks = build_element_blocks(po.get('methods'))
+    class_lines = [f"package {package};", '',
+     'import org.openqa.selenium.WebDriver;',
+     'import org.openqa.selenium.WebElement;',
+     'import org.openqa.selenium.interactions.Actions;',
+     'import org.openqa.selenium.JavascriptExecutor;',
+                   'import org.openqa.selenium.support.FindBy;',
+                   'import org.openqa.selenium.support.PageFactory;',
+                   '',
+                   f"public class {class_name} extends WebBasePage {{"]
+    if blocks:
+        for block in blocks:
+            class_lines.append(block['field'])
+            class_lines.append('')
+    class_lines.extend([
+        f"    public {class_name}(WebDriver driver) {{",
+        '        super(driver);',
+        '        PageFactory.initElements(driver, this);',
+        '    }',
+        ''
+    ])
+    for block in blocks:
+        class_lines.append(block['actions'])
+        class_lines.append('')
+    class_lines.append('}')
+    return JAVA_DIR / '/'.join(package_parts[:-1]) / f"{class_name}.java", '\n'.join(class_lines)
+
+
+def method_base_name(method, idx):
+    return camel_case(method.get('name') or method.get('description', '') or f'element{idx + 1}')
+
+
+def locator_key(method, base):
+    locator = method.get('locator')
+    if not locator or not locator.get('value'):
+        return ('name', base)
+    return (locator.get('strategy', 'css'), locator['value'])
+
+
+def page_group(url, po, shared):
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    host = host[len('www.'):] if host.startswith('www.') else host
+    segments = re.findall(r"[a-z0-9]+", f"{host} {parts.path}", re.I)
+    name = ''.join(segment.capitalize() for segment in segments)
+    key = (host, parts.path.strip('/'))
+    if not shared:
+        simple = po['className'].split('.')[-1]
+        name += simple[:-len('Page')] if simple.endswith('Page') else simple
+        key += (simple,)
+    return key, name or 'Generated'
+
+
+class PageIndex:
+    def __init__(self):
+        self.pages = {}
+        self.groups = {}
+        self.sources = 0
+        self.methods = 0
+
+    def page_for(self, key, name):
+        fqcn = self.groups.get(key)
+        if fqcn is None:
+            fqcn = f"{PAGE_PACKAGE}.{name}Page"
+            counter = 1
+            while fqcn in self.pages:
+                fqcn = f"{PAGE_PACKAGE}.{name}{counter}Page"
+                counter += 1
+            self.groups[key] = fqcn
+            self.pages[fqcn] = {'className': fqcn, 'methods': [], 'fields': {}, 'used': set(), 'sources': []}
+        return self.pages[fqcn]
+
+    def add_field(self, page, method, idx):
+        base = method_base_name(method, idx)
+        key = locator_key(method, base)
+        name = page['fields'].get(key)
+        if name is None:
+            name = method.get('name') or base
+            counter = 1
+            while camel_case(name) in page['used']:
+                name = f"{base} {counter}"
+                counter += 1
+            page['used'].add(camel_case(name))
+            page['fields'][key] = name
+            page['methods'].append(dict(method, name=name))
+        return name
+
+    def add(self, contract):
+        url = contract.get('meta', {}).get('url')
+        page_objects = contract.get('pageObjects', [])
+        if not url or not page_objects:
+            return contract
+        case_id = contract.get('meta', {}).get('caseId')
+        shared = len(page_objects) == 1
+        renames = {}
+        for po in page_objects:
+            page = self.page_for(*page_group(url, po, shared))
+            fields = {}
+            for idx, method in enumerate(po.get('methods') or []):
+                fields.setdefault(method_base_name(method, idx), self.add_field(page, method, idx))
+            self.sources += 1
+            self.methods += len(po.get('methods') or [])
+            page['sources'].append({'caseId': case_id, 'className': po['className'], 'fields': fields})
+            renames[po['className']] = (page['className'], fields)
+        steps = []
+        for step in contract.get('stepDefinitions', []):
+            action = step.get('action') or {}
+            target = renames.get(action.get('pageObjectClass'))
+            if target:
+                po_class, fields = target
+                base = camel_case(action.get('baseName', 'element'))
+                action = dict(action, pageObjectClass=po_class, baseName=fields.get(base, action.get('baseName')))
+                step = dict(step, action=action)
+            steps.append(step)
+        return dict(contract, stepDefinitions=steps, pageObjects=[])
+
+    def page_objects(self):
+        return [{'className': page['className'], 'methods': page['methods']} for page in self.pages.values()]
+
+    def report(self):
+        return {
+            page['className']: {
+                'fields': {name: method.get('locator') for name, method in
+                           ((camel_case(method['name']), method) for method in page['methods'])},
+                'sources': [dict(source, fields={old: camel_case(new) for old, new in source['fields'].items()})
+                            for source in page['sources']],
+            }
+            for page in self.pages.values()
+        }
+
+    def summary(self):
+        fields = sum(len(page['methods']) for page in self.pages.values())
+        lines = [f"PageObjects consolidados: {self.sources} clases -> {len(self.pages)}, "
+                 f"{self.methods} campos -> {fields}"]
+        for page in list(self.pages.values())[:MAX_REPORTED_PAGES]:
+            lines.append(f"  - {page['className'].split('.')[-1]} <- {len(page['sources'])} PageObjects, "
+                         f"{len(page['methods'])} campos")
+        if len(self.pages) > MAX_REPORTED_PAGES:
+            lines.append(f"  ... y {len(self.pages) - MAX_REPORTED_PAGES} más")
+        return '\n'.join(lines)
+
+
+def render_base_page():
     lines = [f"package {PAGE_PACKAGE};", '',
              'import org.openqa.selenium.*;',
              'import org.openqa.selenium.interactions.Actions;',
@@ -493,11 +829,10 @@ def write_base_page(output_dir):
              '        return element.getText();',
              '    }',
              '}']
-    write_file(dir_path / 'WebBasePage.java', '\n'.join(lines))
+    return JAVA_DIR / '/'.join(PAGE_PACKAGE.split('.')) / 'WebBasePage.java', '\n'.join(lines)
 
 
-def write_hooks(output_dir):
-    dir_path = Path(output_dir) / 'test/java' / '/'.join(HOOKS_PACKAGE.split('.'))
+def render_hooks():
     lines = [f"package {HOOKS_PACKAGE};", '',
              'import io.cucumber.java.After;',
              'import io.cucumber.java.Before;',
@@ -524,11 +859,244 @@ def write_hooks(output_dir):
              '        return driver;',
              '    }',
              '}',]
-    write_file(dir_path / 'Hooks.java', '\n'.join(lines))
+    return JAVA_DIR / '/'.join(HOOKS_PACKAGE.split('.')) / 'Hooks.java', '\n'.join(lines)
+
+
+def render_driver_factory():
+    lines = [f"package {HOOKS_PACKAGE};", '',
+             'import org.openqa.selenium.MutableCapabilities;',
+             'import org.openqa.selenium.WebDriver;',
+             'import org.openqa.selenium.chrome.ChromeDriver;',
+             'import org.openqa.selenium.chrome.ChromeOptions;',
+             'import org.openqa.selenium.edge.EdgeDriver;',
+             'import org.openqa.selenium.edge.EdgeOptions;',
+             'import org.openqa.selenium.firefox.FirefoxDriver;',
+             'import org.openqa.selenium.firefox.FirefoxOptions;',
+             'import org.openqa.selenium.remote.RemoteWebDriver;',
+             '',
+             'import java.net.MalformedURLException;',
+             'import java.net.URI;',
+             'import java.util.Locale;',
+             '',
+             'public final class DriverFactory {',
+             '    private DriverFactory() {',
+             '    }',
+             '',
+             '    public static WebDriver create() {',
+             '        String browser = System.getenv().getOrDefault("SELENIUM_BROWSER", "chrome").toLowerCase(Locale.ROOT);',
+             '        boolean headless = Boolean.parseBoolean(System.getenv("SELENIUM_HEADLESS"));',
+             '        String remoteUrl = System.getenv("SELENIUM_REMOTE_URL");',
+             '        MutableCapabilities options = switch (browser) {',
+             '            case "firefox" -> {',
+             '                FirefoxOptions firefox = new FirefoxOptions();',
+             '                if (headless) {',
+             '                    firefox.addArguments("-headless");',
+             '                }',
+             '                yield firefox;',
+             '            }',
+             '            case "edge" -> {',
+             '                EdgeOptions edge = new EdgeOptions();',
+             '                if (headless) {',
+             '                    edge.addArguments("--headless=new");',
+             '                }',
+             '                yield edge;',
+             '            }',
+             '            default -> {',
+             '                ChromeOptions chrome = new ChromeOptions();',
+             '                if (headless) {',
+             '                    chrome.addArguments("--headless=new");',
+             '                }',
+             '                yield chrome;',
+             '            }',
+             '        };',
+             '        if (remoteUrl != null && !remoteUrl.isBlank()) {',
+             '            try {',
+             '                return new RemoteWebDriver(URI.create(remoteUrl).toURL(), options);',
+             '            } catch (MalformedURLException | IllegalArgumentException e) {',
+             '                throw new IllegalStateException("SELENIUM_REMOTE_URL inválida: " + remoteUrl, e);',
+             '            }',
+             '        }',
+             '        if (options instanceof FirefoxOptions firefox) {',
+             '            return new FirefoxDriver(firefox);',
+             '        }',
+             '        if (options instanceof EdgeOptions edge) {',
+             '            return new EdgeDriver(edge);',
+             '        }',
+             '        return new ChromeDriver((ChromeOptions) options);',
+             '    }',
+             '}',]
+    return JAVA_DIR / '/'.join(HOOKS_PACKAGE.split('.')) / 'DriverFactory.java', '\n'.join(lines)
+
+
+def render_parallel_hooks():
+    lines = [f"package {HOOKS_PACKAGE};", '',
+             'import io.cucumber.java.After;',
+             'import io.cucumber.java.Before;',
+             'import org.openqa.selenium.WebDriver;',
+             '',
+             'public class Hooks {',
+             '    private static final ThreadLocal<WebDriver> DRIVER = new ThreadLocal<>();',
+             '',
+             '    @Before',
+             '    public void beforeScenario() {',
+             '        DRIVER.set(DriverFactory.create());',
+             '    }',
+             '',
+             '    @After',
+             '    public void afterScenario() {',
+             '        WebDriver driver = DRIVER.get();',
+             '        DRIVER.remove();',
+             '        if (driver != null) {',
+             '            driver.quit();',
+             '        }',
+             '    }',
+             '',
+             '    public static WebDriver getDriver() {',
+             '        return DRIVER.get();',
+             '    }',
+             '}',]
+    return JAVA_DIR / '/'.join(HOOKS_PACKAGE.split('.')) / 'Hooks.java', '\n'.join(lines)
 
 
-def write_runner(output_dir):
-    dir_path = Path(output_dir) / 'test/java' / '/'.join(RUNNER_PACKAGE.split('.'))
+def render_pooled_hooks(max_scenarios):
+    lines = [f"package {HOOKS_PACKAGE};", '',
+             'import io.cucumber.java.After;',
+             'import io.cucumber.java.Before;',
+             'import io.cucumber.java.Scenario;',
+             'import org.openqa.selenium.JavascriptExecutor;',
+             'import org.openqa.selenium.WebDriver;',
+             'import org.openqa.selenium.WebDriverException;',
+             'import org.openqa.selenium.chromium.HasCdp;',
+             '',
+             'import java.util.Map;',
+             'import java.util.Set;',
+             'import java.util.concurrent.ConcurrentHashMap;',
+             '',
+             'public class Hooks {',
+             f'    private static final int DEFAULT_MAX_SCENARIOS = {max_scenarios};',
+             '    private static final int MAX_SCENARIOS = maxScenarios();',
+             '    private static final ThreadLocal<Session> SESSION = new ThreadLocal<>();',
+             '    private static final Set<WebDriver> OPEN = ConcurrentHashMap.newKeySet();',
+             '',
+             '    static {',
+             '        Runtime.getRuntime().addShutdownHook(new Thread(() -> OPEN.forEach(Hooks::quit)));',
+             '    }',
+             '',
+             '    private static final class Session {',
+             '        private final WebDriver driver = DriverFactory.create();',
+             '        private int scenarios;',
+             '    }',
+             '',
+             '    @Before',
+             '    public void beforeScenario() {',
+             '        Session session = SESSION.get();',
+             '        if (session == null) {',
+             '            session = new Session();',
+             '            OPEN.add(session.driver);',
+             '            SESSION.set(session);',
+             '        }',
+             '        session.scenarios++;',
+             '    }',
+             '',
+             '    @After',
+             '    public void afterScenario(Scenario scenario) {',
+             '        Session session = SESSION.get();',
+             '        if (session == null) {',
+             '            return;',
+             '        }',
+             '        if (scenario.isFailed() || session.scenarios >= MAX_SCENARIOS || !reset(session.driver)) {',
+             '            SESSION.remove();',
+             '            OPEN.remove(session.driver);',
+             '            quit(session.driver);',
+             '        }',
+             '    }',
+             '',
+             '    public static WebDriver getDriver() {',
+             '        Session session = SESSION.get();',
+             '        return session == null ? null : session.driver;',
+             '    }',
+             '',
+             '    private static boolean reset(WebDriver driver) {',
+             '        try {',
+             '            String main = driver.getWindowHandle();',
+             '            for (String handle : driver.getWindowHandles()) {',
+             '                if (!handle.equals(main)) {',
+             '                    driver.switchTo().window(handle).close();',
+             '                }',
+             '            }',
+             '            driver.switchTo().window(main);',
+             '            if (driver instanceof JavascriptExecutor js) {',
+             '                js.executeScript("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}");',
+             '            }',
+             '            driver.manage().deleteAllCookies();',
+             '            if (driver instanceof HasCdp cdp) {',
+             '                cdp.executeCdpCommand("Network.clearBrowserCookies", Map.of());',
+             '            }',
+             '            driver.get("about:blank");',
+             '            return true;',
+             '        } catch (WebDriverException e) {',
+             '            return false;',
+             '        }',
+             '    }',
+             '',
+             '    private static void quit(WebDriver driver) {',
+             '        try {',
+             '            driver.quit();',
+             '        } catch (WebDriverException ignored) {',
+             '        }',
+             '    }',
+             '',
+             '    private static int maxScenarios() {',
+             '        String value = System.getenv("SELENIUM_SESSION_REUSE");',
+             '        try {',
+             '            return value == null || value.isBlank() ? DEFAULT_MAX_SCENARIOS : Integer.parseInt(value.trim());',
+             '        } catch (NumberFormatException e) {',
+             '            return DEFAULT_MAX_SCENARIOS;',
+             '        }',
+             '    }',
+             '}',]
+    return JAVA_DIR / '/'.join(HOOKS_PACKAGE.split('.')) / 'Hooks.java', '\n'.join(lines)
+
+
+def render_parallel_runner():
+    lines = [f"package {RUNNER_PACKAGE};", '',
+             'import io.cucumber.testng.AbstractTestNGCucumberTests;',
+             'import io.cucumber.testng.CucumberOptions;',
+             'import org.testng.annotations.DataProvider;',
+             '',
+             '@CucumberOptions(',
+             '        features = "classpath:features",',
+             f'        glue = {{"{STEP_PACKAGE}", "{HOOKS_PACKAGE}"}},',
+             '        plugin = "pretty",',
+             '        monochrome = true',
+             ')',
+             'public class RunCukesTest extends AbstractTestNGCucumberTests {',
+             '    @Override',
+             '    @DataProvider(parallel = true)',
+             '    public Object[][] scenarios() {',
+             '        return super.scenarios();',
+             '    }',
+             '}',]
+    return JAVA_DIR / '/'.join(RUNNER_PACKAGE.split('.')) / 'RunCukesTest.java', '\n'.join(lines)
+
+
+def render_parallel_settings(threads):
+    lines = ['// Ejecución paralela de escenarios: Cucumber TestNG con un DataProvider paralelo.',
+             '// Un solo fork JVM; los escenarios se reparten entre hilos (-PcucumberThreads=N para cambiarlo).',
+             'dependencies {',
+             f"    testImplementation 'io.cucumber:cucumber-testng:{CUCUMBER_VERSION}'",
+             '}',
+             '',
+             'test {',
+             '    useTestNG()',
+             '    maxParallelForks = 1',
+             f"    systemProperty 'dataproviderthreadcount', findProperty('cucumberThreads') ?: '{threads}'",
+             '}',
+             '']
+    return PARALLEL_SETTINGS, '\n'.join(lines)
+
+
+def render_runner():
     lines = [f"package {RUNNER_PACKAGE};", '',
              'import org.junit.runner.RunWith;',
              'import io.cucumber.junit.Cucumber;',
@@ -536,22 +1104,163 @@ def write_runner(output_dir):
              '',
              '@RunWith(Cucumber.class)',
              '@CucumberOptions(',
-             '        features = "generator/src/test/resources/features",',
+             '        features = "classpath:features",',
              f'        glue = {{"{STEP_PACKAGE}", "{HOOKS_PACKAGE}"}},',
              '        plugin = "pretty",',
              '        monochrome = true',
              ')',
              'public class RunCukesTest {',
              '}',]
-    write_file(dir_path / 'RunCukesTest.java', '\n'.join(lines))
+    return JAVA_DIR / '/'.join(RUNNER_PACKAGE.split('.')) / 'RunCukesTest.java', '\n'.join(lines)
+
+
+### Render and write
+
+def contract_jobs(idx, contract, feature=True):
+    jobs = [(render_feature_file, (idx, contract))] if feature else []
+    jobs.extend((render_page_object, (po,)) for po in contract.get('pageObjects', []))
+    return jobs
+
+
+def static_jobs(parallel=0, reuse_browser=0):
+    if not parallel and not reuse_browser:
+        return [(render, ()) for render in (render_base_page, render_hooks, render_runner)]
+    jobs = [(render_base_page, ()), (render_driver_factory, ())]
+    if reuse_browser:
+        jobs.append((render_pooled_hooks, (reuse_browser,)))
+    else:
+        jobs.append((render_parallel_hooks, ()))
+    if parallel:
+        jobs.extend([(render_parallel_runner, ()), (render_parallel_settings, (parallel,))])
+    else:
+        jobs.append((render_runner, ()))
+    return jobs
+
+
+def glue_jobs(glue_map, parallel=0, reuse_browser=0):
+    jobs = [(render_step_class, (glue, dict(data, pages=list(data['pages'])))) for glue, data in glue_map.items()]
+    jobs.extend(static_jobs(parallel, reuse_browser))
+    return jobs
+
+
+def render_jobs(contracts):
+    jobs = [job for idx, contract in enumerate(contracts) for job in contract_jobs(idx, contract)]
+    jobs.extend(glue_jobs(collect_glue_data(contracts)))
+    return jobs
+
+
+def render_chunk(jobs):
+    return [render(*args) for render, args in jobs]
+
+
+def render_parallel(executor, jobs):
+    chunks = [jobs[start:start + RENDER_CHUNK_JOBS] for start in range(0, len(jobs), RENDER_CHUNK_JOBS)]
+    return [artifact for rendered in executor.map(render_chunk, chunks) for artifact in rendered]
+
+
+def render_artifacts(contracts, workers=1):
+    jobs = render_jobs(contracts)
+    if workers <= 1 or len(jobs) < PARALLEL_RENDER_MIN_JOBS:
+        return render_chunk(jobs)
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, -(-len(jobs) // RENDER_CHUNK_JOBS))) as executor:
+        return render_parallel(executor, jobs)
+
+
+def build_tree(artifacts):
+    tree = {}
+    for relative, content in artifacts:
+        tree[relative.as_posix()] = content
+    return tree
+
+
+def render_tree(contracts, workers=None):
+    return build_tree(render_artifacts(contracts, workers or os.cpu_count() or 1))
+
+
+def write_tree(tree, output_dir, writer=None, workers=1):
+    files = [(Path(output_dir) / relative, content) for relative, content in tree.items()]
+    sequential = writer is not None and not writer.concurrent_writes
+    if sequential or workers <= 1 or len(files) < PARALLEL_RENDER_MIN_JOBS:
+        for path, content in files:
+            write_file(path, content, writer)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    for parent in {path.parent for path, _ in files}:
+        parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=WRITE_THREADS) as executor:
+        list(executor.map(lambda item: write_file(item[0], item[1], writer), files))
+
+
+def generate_artifacts(contracts, output_dir=None, writer=None, workers=None):
+    workers = workers or os.cpu_count() or 1
+    tree = render_tree(contracts, workers)
+    if output_dir is not None:
+        write_tree(tree, Path(output_dir), writer, workers)
+    return tree
+
+
+class ArtifactStream:
+    def __init__(self, output_dir, writer=None, workers=None, chunk_jobs=STREAM_RENDER_JOBS, step_index=None,
+                 page_index=None, outline_index=None, parallel=0, reuse_browser=0):
+        if parallel < 0:
+            raise ValueError("La cantidad de hilos paralelos no puede ser negativa.")
+        if reuse_browser < 0:
+            raise ValueError("La cantidad de escenarios por navegador no puede ser negativa.")
+        self.output_dir = Path(output_dir)
+        self.writer = writer
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_jobs = chunk_jobs
+        self.step_index = step_index
+        self.page_index = page_index
+        self.outline_index = outline_index
+        self.parallel = parallel
+        self.reuse_browser = reuse_browser
+        self.glue_map = step_index.glue_map if step_index is not None else {}
+        self.pending = []
+        self.count = 0
+        self.executor = None
+
+    def add(self, contract):
+        if self.page_index is not None:
+            contract = self.page_index.add(contract)
+        if self.step_index is not None:
+            self.step_index.add(contract)
+        else:
+            add_glue_data(self.glue_map, contract)
+        outlined = self.outline_index is not None and self.outline_index.add(self.count, contract)
+        self.pending.extend(contract_jobs(self.count, contract, feature=not outlined))
+        self.count += 1
+        if len(self.pending) >= self.chunk_jobs:
+            self.flush()
+
+    def render(self, jobs):
+        if self.workers <= 1 or len(jobs) < PARALLEL_RENDER_MIN_JOBS:
+            return render_chunk(jobs)
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return render_parallel(self.executor, jobs)
 
+    def flush(self):
+        jobs, self.pending = self.pending, []
+        if jobs:
+            write_tree(build_tree(self.render(jobs)), self.output_dir, self.writer, self.workers)
 
-def generate_artifacts(contracts, output_dir):
-    output_dir = Path(output_dir)
-    write_features(contracts, output_dir)
-    write_step_classes(contracts, output_dir)
-    write_page_objects(contracts, output_dir)
-    write_base_page(output_dir)
-    write_hooks(output_dir)
-    write_runner(output_dir)
+    def finish(self):
+        if self.outline_index is not None:
+            self.pending.extend(self.outline_index.jobs())
+        if self.page_index is not None:
+            self.pending.extend((render_page_object, (po,)) for po in self.page_index.page_objects())
+        self.pending.extend(glue_jobs(self.glue_map, self.parallel, self.reuse_browser))
+        self.glue_map = {}
+        try:
+            self.flush()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
 from .utils.strings import camel_case, extract_url, slugify
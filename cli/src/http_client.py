@@ -0,0 +1,202 @@
+import gzip
+import http.client
+import json
+import threading
+import time
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+DEFAULT_POOL_SIZE = 8
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+_DEADLINE = threading.local()
+
+
+@contextmanager
+def request_deadline(deadline):
+    previous = getattr(_DEADLINE, 'value', None)
+    _DEADLINE.value = deadline
+    try:
+        yield
+    finally:
+        _DEADLINE.value = previous
+
+
+def remaining_time():
+    deadline = getattr(_DEADLINE, 'value', None)
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Se agotó el plazo de la solicitud a la IA")
+    return remaining
+
+
+class HttpError(RuntimeError):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ConnectionPool:
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=None, gzip_enabled=False):
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.gzip_enabled = gzip_enabled
+        self._idle = defaultdict(list)
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _origin(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Esquema HTTP no soportado: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return (parts.scheme, parts.hostname, port), path
+
+    def _slot(self, origin):
+        with self._lock:
+            if origin not in self._slots:
+                self._slots[origin] = threading.BoundedSemaphore(self.pool_size)
+            return self._slots[origin]
+
+    def _acquire(self, origin, timeout):
+        with self._lock:
+            idle = self._idle[origin]
+            conn = idle.pop() if idle else None
+        if conn is None:
+            scheme, host, port = origin
+            factory = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            return factory(host, port, timeout=timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, origin, conn, reusable):
+        if not reusable:
+            conn.close()
+            return
+        with self._lock:
+            self._idle[origin].append(conn)
+
+    def _open(self, method, url, body, headers, timeout):
+        origin, path = self._origin(url)
+        timeout = self.timeout if self.timeout is not None else timeout
+        remaining = remaining_time()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        headers = dict(headers or {})
+        if self.gzip_enabled:
+            headers['Accept-Encoding'] = 'gzip'
+            if body:
+                body = gzip.compress(body)
+                headers['Content-Encoding'] = 'gzip'
+        slot = self._slot(origin)
+        slot.acquire()
+        try:
+            while True:
+                conn, reused = self._acquire(origin, timeout)
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    return origin, slot, conn, conn.getresponse()
+                except STALE_CONNECTION_ERRORS:
+                    conn.close()
+                    if not reused:
+                        raise
+                except Exception:
+                    conn.close()
+                    raise
+        except BaseException:
+            slot.release()
+            raise
+
+    def _finish(self, origin, slot, conn, resp, completed):
+        if completed and not resp.isclosed():
+            resp.close()
+        self._release(origin, conn, completed and not resp.will_close)
+        slot.release()
+
+    def _check_status(self, origin, resp):
+        if resp.status >= 400:
+            headers = {key.lower(): value for key, value in resp.getheaders()}
+            raise HttpError(resp.status, f"HTTP {resp.status} desde {origin[1]}", headers)
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        origin, slot, conn, resp = self._open(method, url, body, headers, timeout)
+        completed = False
+        try:
+            data = resp.read()
+            completed = True
+        finally:
+            self._finish(origin, slot, conn, resp, completed)
+        response_headers = {key.lower(): value for key, value in resp.getheaders()}
+        if response_headers.get('content-encoding') == 'gzip':
+            data = gzip.decompress(data)
+        self._check_status(origin, resp)
+        return resp.status, response_headers, data
+
+    def stream(self, method, url, body=None, headers=None, timeout=None, chunk_size=4096):
+        origin, slot, conn, resp = self._open(method, url, body, headers, timeout)
+        completed = False
+        try:
+            if resp.status >= 400:
+                resp.read()
+                completed = True
+                self._check_status(origin, resp)
+            decoder = None
+            if (resp.getheader('content-encoding') or '').lower() == 'gzip':
+                decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            while True:
+                remaining_time()
+                chunk = resp.read1(chunk_size)
+                if not chunk:
+                    break
+                yield decoder.decompress(chunk) if decoder else chunk
+            completed = True
+        finally:
+            self._finish(origin, slot, conn, resp, completed)
+
+    def post_json(self, url, payload, timeout=None):
+        data = json.dumps(payload).encode('utf-8')
+        _, _, body = self.request('POST', url, body=data,
+                                  headers={'Content-Type': 'application/json'}, timeout=timeout)
+        return json.loads(body.decode('utf-8'))
+
+    def post_json_stream(self, url, payload, timeout=None):
+        data = json.dumps(payload).encode('utf-8')
+        return self.stream('POST', url, body=data,
+                           headers={'Content-Type': 'application/json'}, timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def configure_pool(pool_size=DEFAULT_POOL_SIZE, timeout=None, gzip_enabled=False):
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+        _POOL = ConnectionPool(pool_size, timeout=timeout, gzip_enabled=gzip_enabled)
+    return _POOL
+
+
+def get_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool()
+        return _POOL
@@ -0,0 +1,89 @@
+from pathlib import Path
+import glob
+import os
+
+from .parser import CaseIndex, find_cases, iter_cases, parse_cases
+
+CASE_FILE_PATTERN = '*.txt'
+GLOB_CHARS = set('*?[')
+
+
+def expand_inputs(inputs):
+    files = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = sorted(path.rglob(CASE_FILE_PATTERN))
+        elif GLOB_CHARS & set(item):
+            matches = sorted(Path(match) for match in glob.glob(item, recursive=True))
+        else:
+            matches = [path]
+        files.extend(match for match in matches if not match.is_dir())
+    unique = list(dict.fromkeys(files))
+    if not unique:
+        raise ValueError(f"No se encontraron archivos de casos en: {', '.join(inputs)}")
+    return unique
+
+
+def load_case_file(path, ids=(), tags=()):
+    path = Path(path)
+    if ids or tags:
+        return find_cases(path, ids=ids, tags=tags)
+    return parse_cases(path)
+
+
+def iter_case_files(paths, ids=(), tags=(), workers=None):
+    workers = workers or os.cpu_count() or 1
+    if len(paths) <= 1 or workers <= 1:
+        for path in paths:
+            yield path, load_case_file(path, ids, tags) if ids or tags else iter_cases(path)
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        futures = {executor.submit(load_case_file, str(path), tuple(ids), tuple(tags)): position
+                   for position, path in enumerate(paths)}
+        ready = {}
+        position = 0
+        try:
+            for future in as_completed(futures):
+                ready[futures[future]] = future.result()
+                while position in ready:
+                    yield paths[position], ready.pop(position)
+                    position += 1
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class CaseCatalog:
+    def __init__(self):
+        self.owners = {}
+        self.files = 0
+        self.cases = 0
+
+    def check(self, paths, ids=(), tags=()):
+        owners = {}
+        for path in paths:
+            index = CaseIndex.open(path)
+            positions = index.select(ids, tags) if ids or tags else range(len(index.ids))
+            for case_id in dict.fromkeys(index.ids[position] for position in positions):
+                owner = owners.setdefault(case_id, path)
+                if owner != path:
+                    raise ValueError(f"ID de caso duplicado entre archivos: {case_id} ({owner}, {path})")
+
+    def add(self, path, case):
+        self.cases += 1
+        owner = self.owners.setdefault(case.get("id"), path)
+        if owner != path:
+            raise ValueError(f"ID de caso duplicado entre archivos: {case.get('id')} ({owner}, {path})")
+
+    def iter_cases(self, files):
+        for path, cases in files:
+            self.files += 1
+            for case in cases:
+                self.add(path, case)
+                yield case
+
+    def summary(self):
+        return f"Ingesta: {self.cases} casos en {self.files} archivos"
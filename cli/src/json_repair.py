@@ -0,0 +1,131 @@
+import json
+import re
+
+CLOSERS = {'{': '}', '[': ']'}
+
+
+def strip_fences(text):
+    cleaned = (text or '').strip()
+    cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned, flags=re.I)
+    return re.sub(r"\s*```$", "", cleaned)
+
+
+def drop_trailing_comma(chars):
+    while chars and chars[-1].isspace():
+        chars.pop()
+    if chars and chars[-1] == ',':
+        chars.pop()
+
+
+def close(chars, stack):
+    chars = list(chars)
+    drop_trailing_comma(chars)
+    while chars and chars[-1] == ':':
+        chars.pop()
+        while chars and chars[-1] != '"':
+            chars.pop()
+        if chars:
+            chars.pop()
+        while chars and chars[-1] != '"':
+            chars.pop()
+        if chars:
+            chars.pop()
+        drop_trailing_comma(chars)
+    return ''.join(chars) + ''.join(CLOSERS[opener] for opener in reversed(stack))
+
+
+def repair_json(text, array=False):
+    cleaned = strip_fences(text)
+    start = cleaned.find('[' if array else '{')
+    if start == -1:
+        raise ValueError("No se encontró JSON en la respuesta")
+    chars = []
+    stack = []
+    in_string = escape = False
+    safe_chars, safe_stack = [], []
+    for ch in cleaned[start:]:
+        if in_string:
+            chars.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+            chars.append(ch)
+        elif ch in CLOSERS:
+            stack.append(ch)
+            chars.append(ch)
+            safe_chars, safe_stack = list(chars), list(stack)
+        elif ch in '}]':
+            if not stack or CLOSERS[stack[-1]] != ch:
+                break
+            drop_trailing_comma(chars)
+            stack.pop()
+            chars.append(ch)
+            if not stack:
+                return json.loads(''.join(chars)), False
+            safe_chars, safe_stack = list(chars), list(stack)
+        elif ch == ',':
+            safe_chars, safe_stack = list(chars), list(stack)
+            chars.append(ch)
+        else:
+            chars.append(ch)
+    candidates = []
+    if stack:
+        candidates.append(close(chars + (['"'] if in_string else []), stack))
+    if safe_stack:
+        candidates.append(close(safe_chars, safe_stack))
+    for candidate in candidates:
+        try:
+            return json.loads(candidate), True
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("No fue posible reparar el JSON truncado")
+
+
+def covers_step(definition, text):
+    pattern = definition.get('stepText') or ''
+    if pattern == text:
+        return True
+    try:
+        return re.fullmatch(pattern, text) is not None
+    except re.error:
+        return False
+
+
+def salvage_contract(contract, sections, validate_section):
+    salvaged = {}
+    for name in sections:
+        if name not in contract:
+            continue
+        value = contract[name]
+        if isinstance(value, list):
+            value = [item for item in value if validate_section(name, [item])[0]]
+        elif not validate_section(name, value)[0]:
+            continue
+        salvaged[name] = value
+    return salvaged
+
+
+def contract_steps(test_case, contract):
+    scenarios = (contract.get('gherkin') or {}).get('scenarios') or []
+    steps = [step.get('text') for scenario in scenarios for step in scenario.get('steps') or []]
+    return [text for text in steps if text] or list(test_case.get('steps', []))
+
+
+def missing_sections(test_case, contract, required):
+    missing = [name for name in required if not contract.get(name)]
+    definitions = contract.get('stepDefinitions') or []
+    uncovered = []
+    if definitions:
+        uncovered = [text for text in dict.fromkeys(contract_steps(test_case, contract))
+                     if not any(covers_step(definition, text) for definition in definitions)]
+    if contract.get('pageObjects') and 'stepDefinitions' not in missing:
+        methods = {method.get('name') for page in contract['pageObjects'] for method in page.get('methods') or []}
+        if any((definition.get('action') or {}).get('baseName') not in methods for definition in definitions):
+            missing.append('pageObjects')
+    return missing, uncovered
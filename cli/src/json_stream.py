@@ -0,0 +1,134 @@
+import codecs
+import json
+
+from .json_repair import repair_json
+
+MAX_PREFIX_CHARS = 512
+
+
+class StreamDiverged(RuntimeError):
+    pass
+
+
+class StreamIncomplete(StreamDiverged):
+    def __init__(self, message, partial):
+        super().__init__(message)
+        self.partial = partial
+
+
+class ContractStreamParser:
+    def __init__(self, allowed_keys, validate_section=None):
+        self.allowed_keys = set(allowed_keys)
+        self.validate_section = validate_section
+        self.sections = {}
+        self.done = False
+        self._buffer = ''
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._member_start = 0
+        self._key_start = None
+        self._key_checked = False
+
+    def feed(self, text):
+        if self.done or not text:
+            return []
+        self._buffer += text
+        completed = []
+        buf = self._buffer
+        for idx in range(self._pos, len(buf)):
+            ch = buf[idx]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and not self._key_checked:
+                        self._check_key(buf[self._key_start:idx + 1])
+                continue
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = idx + 1
+                elif idx >= MAX_PREFIX_CHARS:
+                    raise StreamDiverged("La respuesta no comienza con un objeto JSON")
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and not self._key_checked:
+                    self._key_start = idx
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._emit(buf[self._member_start:idx]))
+                    self.done = True
+                    self._pos = idx + 1
+                    return completed
+            elif ch == ',' and self._depth == 1:
+                completed.extend(self._emit(buf[self._member_start:idx]))
+                self._member_start = idx + 1
+        self._pos = len(buf)
+        return completed
+
+    def _check_key(self, raw_key):
+        self._key_checked = True
+        key = json.loads(raw_key)
+        if key not in self.allowed_keys:
+            raise StreamDiverged(f"Sección inesperada en el contrato: '{key}'")
+
+    def _emit(self, member):
+        self._key_checked = False
+        if not member.strip():
+            return []
+        try:
+            section = json.loads('{' + member + '}')
+        except json.JSONDecodeError as exc:
+            raise StreamDiverged(f"Sección con JSON inválido: {exc}") from exc
+        key, value = next(iter(section.items()))
+        if self.validate_section:
+            valid, errors = self.validate_section(key, value)
+            if not valid:
+                raise StreamIncomplete(f"Sección '{key}' no cumple el esquema: {errors}", dict(self.sections))
+        self.sections[key] = value
+        return [(key, value)]
+
+    def partial(self):
+        partial = dict(self.sections)
+        try:
+            repaired, _ = repair_json(self._buffer)
+        except ValueError:
+            return partial
+        if isinstance(repaired, dict):
+            for key, value in repaired.items():
+                if key in self.allowed_keys:
+                    partial.setdefault(key, value)
+        return partial
+
+    def result(self):
+        if not self.done:
+            raise StreamIncomplete("La respuesta terminó antes de cerrar el contrato JSON", self.partial())
+        return dict(self.sections)
+
+
+def decode_chunks(chunks, encoding='utf-8'):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+
+def parse_contract_stream(texts, allowed_keys, validate_section=None):
+    parser = ContractStreamParser(allowed_keys, validate_section)
+    for text in texts:
+        parser.feed(text)
+        if parser.done:
+            break
+    return parser.result()
@@ -0,0 +1,115 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_NAME = '.iatg_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ArtifactWriter:
+    concurrent_writes = True
+
+    def __init__(self, output_dir, incremental=True, prune=True):
+        self.output_dir = Path(output_dir)
+        self.incremental = incremental
+        self.prune_stale = prune
+        self.previous = self.load()
+        self.entries = {}
+        self.written = set()
+        self.skipped = set()
+        self.deleted = set()
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return self.output_dir / MANIFEST_NAME
+
+    def load(self):
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return {}
+        files = data.get('files')
+        return files if isinstance(files, dict) else {}
+
+    def relative(self, path):
+        return Path(path).relative_to(self.output_dir).as_posix()
+
+    def unchanged(self, path, entry, digest):
+        if not entry or entry.get('sha256') != digest:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtimeNs'):
+            return True
+        try:
+            return content_digest(path.read_text(encoding='utf-8')) == digest
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def write(self, path, content):
+        path = Path(path)
+        rel = self.relative(path)
+        digest = content_digest(content)
+        with self._lock:
+            entry = self.entries.get(rel) or (self.previous.get(rel) if self.incremental else None)
+        unchanged = self.unchanged(path, entry, digest)
+        if not unchanged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+        stat = path.stat()
+        with self._lock:
+            if unchanged and rel not in self.written:
+                self.skipped.add(rel)
+            elif not unchanged:
+                self.skipped.discard(rel)
+                self.written.add(rel)
+            self.entries[rel] = {'sha256': digest, 'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns}
+
+    def prune(self, path):
+        parent = path.parent
+        while parent != self.output_dir and self.output_dir in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                return
+            parent = parent.parent
+
+    def keep_stale(self):
+        self.prune_stale = False
+
+    def carry_forward(self):
+        for rel in sorted(set(self.previous) - set(self.entries)):
+            if (self.output_dir / rel).is_file():
+                self.entries[rel] = self.previous[rel]
+
+    def finish(self):
+        if not self.prune_stale:
+            self.carry_forward()
+        for rel in sorted(set(self.previous) - set(self.entries)):
+            path = self.output_dir / rel
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            self.deleted.add(rel)
+            self.prune(path)
+        payload = {'version': MANIFEST_VERSION, 'files': dict(sorted(self.entries.items()))}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.manifest_path)
+
+    def summary(self):
+        return (f"Artefactos: {len(self.written)} escritos, {len(self.skipped)} sin cambios, "
+                f"{len(self.deleted)} eliminados")
@@ -1,49 +1,179 @@
 from pathlib import Path
+import json
+import os
 
-def parse_cases(path: Path):
-    content = path.read_text(encoding="utf-8")
-    lines = content.splitlines()
-    cases = []
-    current = None
-    mode = None
-
-    def push():
-        nonlocal current
-        if current:
-            current["steps"] = [step for step in current.get("steps", []) if step.strip()]
-            if not current.get("id"):
-                current["id"] = f"case-{len(cases) + 1}"
-            cases.append(current)
-            current = None
-
-    for raw in lines:
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 1
+
+
+class CaseReader:
+    def __init__(self, ordinal=0, steps_mode=False):
+        self.ordinal = ordinal
+        self.mode = "steps" if steps_mode else None
+        self.current = None
+
+    def push(self):
+        current, self.current = self.current, None
+        if not current:
+            return None
+        current["steps"] = [step for step in current.get("steps", []) if step.strip()]
+        self.ordinal += 1
+        if not current.get("id"):
+            current["id"] = f"case-{self.ordinal}"
+        return current
+
+    def feed(self, raw):
         line = raw.strip()
         if not line:
-            continue
+            return None
         if line.startswith("#"):
-            push()
-            current = {"title": line[1:].strip(), "steps": []}
-            continue
+            finished = self.push()
+            self.current = {"title": line[1:].strip(), "steps": []}
+            return finished
+        current = self.current
         if current is None:
-            continue
+            return None
         lower = line.lower()
         if lower.startswith("id:"):
             current["id"] = line.split(":", 1)[1].strip()
-            continue
+            return None
         if lower.startswith("url:"):
             current["url"] = line.split(":", 1)[1].strip()
-            continue
+            return None
         if lower.startswith("tags:"):
             raw_tags = line.split(":", 1)[1].strip()
             current["tags"] = ([tag if tag.startswith('@') else f"@{tag}"
                                  for tag in raw_tags.split()] if raw_tags else [])
-            continue
+            return None
         if lower.startswith("pasos:"):
-            mode = "steps"
-            continue
-        if mode == "steps":
+            self.mode = "steps"
+            return None
+        if self.mode == "steps":
             normalized = line.lstrip("0123456789-.) ").strip()
             current["steps"].append(normalized or line)
+        return None
+
+
+def iter_case_records(path: Path):
+    reader = CaseReader()
+    offset = 0
+    start = steps_mode = None
+    with open(path, 'rb') as handle:
+        for raw in handle:
+            line = raw.decode('utf-8')
+            if line.strip().startswith("#"):
+                finished = reader.feed(line)
+                if finished:
+                    yield finished, {'offset': start, 'length': offset - start, 'steps': steps_mode}
+                start, steps_mode = offset, reader.mode == "steps"
+            else:
+                reader.feed(line)
+            offset += len(raw)
+    finished = reader.push()
+    if finished:
+        yield finished, {'offset': start, 'length': offset - start, 'steps': steps_mode}
+
+
+def iter_cases(path: Path):
+    for case, _ in iter_case_records(path):
+        yield case
+
+
+def parse_cases(path: Path):
+    return list(iter_cases(path))
+
+
+def read_case(handle, offset, length, ordinal, steps_mode):
+    handle.seek(offset)
+    reader = CaseReader(ordinal, steps_mode)
+    for raw in handle.read(length).splitlines():
+        reader.feed(raw.decode('utf-8'))
+    return reader.push()
+
+
+class CaseIndex:
+    def __init__(self, path, ids, offsets, lengths, steps_modes, tags, size=None, mtime_ns=None):
+        self.path = Path(path)
+        self.ids = ids
+        self.offsets = offsets
+        self.lengths = lengths
+        self.steps_modes = steps_modes
+        self.tags = tags
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @staticmethod
+    def index_path(path):
+        path = Path(path)
+        return path.with_name(path.name + INDEX_SUFFIX)
+
+    @classmethod
+    def build(cls, path):
+        ids, offsets, lengths, steps_modes, tags = [], [], [], [], {}
+        for position, (case, record) in enumerate(iter_case_records(path)):
+            ids.append(case.get("id"))
+            offsets.append(record['offset'])
+            lengths.append(record['length'])
+            steps_modes.append('1' if record['steps'] else '0')
+            for tag in case.get("tags", []):
+                tags.setdefault(tag, []).append(position)
+        stat = os.stat(path)
+        return cls(path, ids, offsets, lengths, ''.join(steps_modes), tags, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        stat = os.stat(path)
+        try:
+            data = json.loads(cls.index_path(path).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if (data.get('version') != INDEX_VERSION or data.get('size') != stat.st_size
+                or data.get('mtimeNs') != stat.st_mtime_ns):
+            return None
+        try:
+            return cls(path, data['ids'], data['offsets'], data['lengths'], data['stepsModes'], data['tags'],
+                       data['size'], data['mtimeNs'])
+        except KeyError:
+            return None
+
+    @classmethod
+    def open(cls, path):
+        index = cls.load(path)
+        if index is None:
+            index = cls.build(path)
+            index.save()
+        return index
+
+    def save(self):
+        payload = {
+            'version': INDEX_VERSION, 'size': self.size, 'mtimeNs': self.mtime_ns,
+            'ids': self.ids, 'offsets': self.offsets, 'lengths': self.lengths,
+            'stepsModes': self.steps_modes, 'tags': self.tags,
+        }
+        target = self.index_path(self.path)
+        try:
+            tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp, target)
+        except OSError:
+            return False
+        return True
+
+    def select(self, ids=(), tags=()):
+        ids = set(ids)
+        positions = {position for position, case_id in enumerate(self.ids) if case_id in ids}
+        for tag in tags:
+            positions.update(self.tags.get(tag, []))
+        return sorted(positions)
+
+    def iter_cases(self, positions):
+        with open(self.path, 'rb') as handle:
+            for position in positions:
+                yield read_case(handle, self.offsets[position], self.lengths[position], position,
+                                self.steps_modes[position] == '1')
+
 
-    push()
-    return cases
+def find_cases(path: Path, ids=(), tags=()):
+    index = CaseIndex.open(path)
+    return list(index.iter_cases(index.select(ids, tags)))
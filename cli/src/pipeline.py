@@ -0,0 +1,237 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .ai_client import request_contract
+from .fallback import FALLBACK_ERRORS, is_fallback
+from .assembler import assemble_contract, describe_step_locally, link_shared_steps, normalize_step_info, step_key
+from .gemini_client import plan_batches, request_contracts_from_gemini_batch, request_step_infos_from_gemini
+from .generator import normalize_step_text
+from .repair import ContractValidationError
+from .validator import validate_contract
+
+DEFAULT_BATCH_CHARS = 12000
+STEP_BATCH_SIZE = 25
+STREAM_CHUNK_CASES = 200
+
+
+@dataclass
+class FetchOptions:
+    service_url: str = 'local'
+    concurrency: int = 1
+    cache: Optional[Any] = None
+    batch_size: int = 1
+    batch_chars: int = DEFAULT_BATCH_CHARS
+    stream: bool = False
+    steps: Optional[Any] = None
+    fallback: Optional[Any] = None
+    compact: bool = False
+    repair: Optional[Any] = None
+    registry: dict = field(default_factory=dict)
+
+
+def ensure_valid(case, contract, options=None):
+    if options and options.repair:
+        return options.repair.ensure_valid(case, contract)
+    valid, errors = validate_contract(contract)
+    if not valid:
+        raise ValueError(f"Contrato inválido {case.get('id')}: {errors}")
+    return contract
+
+
+def fetch_contract(case, options):
+    def request():
+        return request_contract(case, options.service_url, stream=options.stream, compact=options.compact)
+
+    contract = options.fallback.call(case, request) if options.fallback else request()
+    contract = ensure_valid(case, contract, options)
+    if options.cache and not is_fallback(contract):
+        options.cache.put(case, options.service_url, contract)
+    return contract
+
+
+def fetch_batch(batch, options):
+    try:
+        received = request_contracts_from_gemini_batch([case for _, case in batch], compact=options.compact)
+    except FALLBACK_ERRORS:
+        if not options.fallback:
+            raise
+        received = {}
+    results = []
+    for idx, case in batch:
+        contract = received.get(case.get('id'))
+        repairable = options.repair and options.repair.can_repair()
+        if contract is None or not (repairable or validate_contract(contract)[0]):
+            results.append(settle(idx, lambda: fetch_contract(case, options)))
+            continue
+        result = settle(idx, lambda: ensure_valid(case, contract, options))
+        if options.cache and result[1] is not None:
+            options.cache.put(case, options.service_url, result[1])
+        results.append(result)
+    return results
+
+
+def settle(idx, produce):
+    try:
+        return idx, produce()
+    except ContractValidationError:
+        return idx, None
+
+
+def fetch_single(batch, options):
+    return [settle(idx, lambda: fetch_contract(case, options)) for idx, case in batch]
+
+
+def plan_jobs(pending, options):
+    if options.service_url != 'gemini' or options.batch_size <= 1:
+        return [(fetch_single, [item]) for item in pending]
+    jobs = []
+    start = 0
+    cases = [case for _, case in pending]
+    for batch in plan_batches(cases, options.batch_size, options.batch_chars, options.compact):
+        jobs.append((fetch_batch, pending[start:start + len(batch)]))
+        start += len(batch)
+    return jobs
+
+
+def run_jobs(jobs, options):
+    if options.concurrency <= 1 or len(jobs) <= 1:
+        return [item for func, batch in jobs for item in func(batch, options)]
+    executor = ThreadPoolExecutor(max_workers=min(options.concurrency, len(jobs)))
+    try:
+        futures = [executor.submit(func, batch, options) for func, batch in jobs]
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception():
+                for other in pending:
+                    other.cancel()
+                raise future.exception()
+        return [item for future in futures for item in future.result()]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def match_step_infos(pending, received):
+    by_step = {normalize_step_text(item.get('step', '')): item for item in received}
+    positional = len(received) == len(pending)
+    for position, (key, text, _, _) in enumerate(pending):
+        info = by_step.get(key[1]) or (received[position] if positional else None)
+        if not info:
+            continue
+        try:
+            yield key, normalize_step_info(info, text)
+        except ValueError:
+            continue
+
+
+def fetch_step_batch(batch, options):
+    if options.service_url == 'local':
+        return [(key, describe_step_locally(text, idx, url)) for key, text, idx, url in batch]
+    resolved = {}
+    pending = batch
+    for _ in range(2):
+        received = request_step_infos_from_gemini(pending[0][3], [text for _, text, _, _ in pending])
+        for key, info in match_step_infos(pending, received):
+            resolved[key] = info
+            if options.cache:
+                options.cache.put_step(key[0], key[1], options.service_url, info)
+        pending = [item for item in pending if item[0] not in resolved]
+        if not pending:
+            return list(resolved.items())
+    missing = ', '.join(text for _, text, _, _ in pending)
+    raise RuntimeError(f"La IA no describió los pasos: {missing}")
+
+
+class StepResolver:
+    def __init__(self):
+        self.total = 0
+        self.unique = 0
+        self.cached = 0
+        self.requested = 0
+        self.calls = 0
+        self.infos = {}
+        self.registry = {}
+
+    def plan(self, pending, options):
+        if options.service_url == 'local':
+            return [(fetch_step_batch, pending)] if pending else []
+        if options.service_url != 'gemini':
+            raise ValueError("El modo por pasos solo está disponible con --service-url local o gemini")
+        by_host = {}
+        for item in pending:
+            by_host.setdefault(item[0][0], []).append(item)
+        jobs = []
+        for items in by_host.values():
+            for start in range(0, len(items), STEP_BATCH_SIZE):
+                jobs.append((fetch_step_batch, items[start:start + STEP_BATCH_SIZE]))
+        self.calls += len(jobs)
+        return jobs
+
+    def resolve(self, cases, options):
+        unique = {}
+        for case in cases:
+            url = case.get('url')
+            for idx, text in enumerate(case.get('steps', [])):
+                self.total += 1
+                unique.setdefault(step_key(text, url), (text, idx, url))
+        self.unique += len(unique)
+        pending = []
+        for key, (text, idx, url) in unique.items():
+            if key in self.infos:
+                continue
+            cached = options.cache.get_step(key[0], key[1], options.service_url) if options.cache else None
+            if cached:
+                self.infos[key] = cached
+                self.cached += 1
+            else:
+                pending.append((key, text, idx, url))
+        resolved = run_jobs(self.plan(pending, options), options)
+        if options.service_url != 'local':
+            self.requested += len(resolved)
+        self.infos.update(resolved)
+        return [
+            settle(idx, lambda: ensure_valid(case, assemble_contract(case, self.infos, self.registry), options))[1]
+            for idx, case in enumerate(cases)
+        ]
+
+    def summary(self):
+        return (f"Pasos: {self.total} totales, {self.unique} únicos, {self.cached} desde caché, "
+                f"{self.requested} resueltos por la IA en {self.calls} solicitudes")
+
+
+def fetch_contracts(cases, options=None):
+    cases = list(cases)
+    options = options or FetchOptions()
+    if options.batch_size > 1 and (options.service_url != 'gemini' or options.steps):
+        raise ValueError("--batch-size solo está disponible con --service-url gemini y sin --step-level")
+    if options.service_url == 'local':
+        options.cache = None
+    if options.steps:
+        return options.steps.resolve(cases, options)
+    contracts = [None] * len(cases)
+    pending = []
+    for idx, case in enumerate(cases):
+        cached = options.cache.get(case, options.service_url) if options.cache else None
+        if cached is not None:
+            contracts[idx] = settle(idx, lambda: ensure_valid(case, cached, options))[1]
+        else:
+            pending.append((idx, case))
+    for idx, contract in run_jobs(plan_jobs(pending, options), options):
+        contracts[idx] = contract
+    if options.compact or options.service_url.startswith(('http://', 'https://')):
+        for contract in contracts:
+            if contract is not None:
+                link_shared_steps(contract, options.registry)
+    return contracts
+
+
+def iter_contracts(cases, options=None, chunk_size=STREAM_CHUNK_CASES):
+    options = options or FetchOptions()
+    chunk = []
+    for case in cases:
+        chunk.append(case)
+        if len(chunk) >= chunk_size:
+            yield from zip(chunk, fetch_contracts(chunk, options))
+            chunk = []
+    if chunk:
+        yield from zip(chunk, fetch_contracts(chunk, options))
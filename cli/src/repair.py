@@ -0,0 +1,87 @@
+import threading
+
+from .validator import contract_errors, required_sections
+
+DEFAULT_REPAIR_ATTEMPTS = 2
+
+
+def describe_errors(case_id, errors, attempts=0):
+    details = '; '.join(f"{path or '/'}: {message}" for path, message in errors)
+    if not attempts:
+        return f"Contrato inválido {case_id}: {details}"
+    return f"Contrato inválido {case_id} tras {attempts} intentos de reparación: {details}"
+
+
+class ContractValidationError(ValueError):
+    def __init__(self, case_id, errors, attempts=0):
+        super().__init__(describe_errors(case_id, errors, attempts))
+        self.case_id = case_id
+        self.errors = errors
+        self.attempts = attempts
+
+
+def failing_sections(contract, errors):
+    sections = []
+    for path, _ in errors:
+        if path:
+            names = [path.split('/', 1)[0]]
+        else:
+            names = [name for name in required_sections() if name not in contract] or list(required_sections())
+        for name in names:
+            if name not in sections:
+                sections.append(name)
+    return sections
+
+
+class ContractRepairer:
+    def __init__(self, max_attempts=DEFAULT_REPAIR_ATTEMPTS, request=None):
+        self.max_attempts = max(0, max_attempts)
+        self.request = request
+        self.cases = {}
+        self._lock = threading.Lock()
+
+    def _record(self, case_id, attempts, errors, valid):
+        with self._lock:
+            entry = self.cases.setdefault(case_id, {'attempts': 0, 'errors': 0, 'valid': True})
+            entry['attempts'] += attempts
+            entry['errors'] += errors
+            entry['valid'] = valid
+
+    def can_repair(self):
+        return bool(self.request and self.max_attempts)
+
+    def ensure_valid(self, case, contract):
+        errors = contract_errors(contract)
+        if not errors:
+            return contract
+        found = len(errors)
+        attempts = 0
+        while errors and self.request and attempts < self.max_attempts:
+            attempts += 1
+            sections = failing_sections(contract, errors)
+            current = {name: contract[name] for name in sections if name in contract}
+            patch = self.request(case, current, errors, sections)
+            contract = dict(contract, **{name: value for name, value in patch.items() if name in sections})
+            errors = contract_errors(contract)
+        self._record(case.get('id'), attempts, found, not errors)
+        if errors and not self.can_repair():
+            raise ValueError(describe_errors(case.get('id'), errors))
+        if errors:
+            raise ContractValidationError(case.get('id'), errors, attempts)
+        return contract
+
+    def failed(self):
+        return sorted(case_id for case_id, entry in self.cases.items() if not entry['valid'])
+
+    def failure_report(self):
+        return ', '.join(f"{case_id} ({self.cases[case_id]['attempts']} intentos)" for case_id in self.failed())
+
+    def summary(self):
+        repaired = [case_id for case_id, entry in self.cases.items() if entry['valid']]
+        requests = sum(entry['attempts'] for entry in self.cases.values())
+        lines = [f"Reparación de contratos: {len(repaired)} reparados, {len(self.failed())} inválidos, "
+                 f"{requests} solicitudes de reparación"]
+        for case_id, entry in sorted(self.cases.items()):
+            status = 'reparado' if entry['valid'] else 'inválido'
+            lines.append(f"  {case_id}: {entry['errors']} errores, {entry['attempts']} intentos, {status}")
+        return '\n'.join(lines)
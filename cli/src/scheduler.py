@@ -0,0 +1,157 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .http_client import HttpError, remaining_time
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ERRORS = (TimeoutError, ConnectionError)
+
+
+def estimate_tokens(text):
+    return max(1, len(text or '') // 4)
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class AdaptiveWindow:
+    def __init__(self, max_size, min_size=1):
+        self.max_size = max(1, max_size)
+        self.min_size = max(1, min(min_size, self.max_size))
+        self.limit = self.max_size
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, failed=False):
+        with self._cond:
+            self._in_flight -= 1
+            if failed:
+                self.limit = max(self.min_size, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_size:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_retries=3,
+                 base_delay=1.0, max_delay=60.0, max_concurrency=8, sleep=time.sleep):
+        self.requests = TokenBucket(requests_per_minute, sleep=sleep) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, sleep=sleep) if tokens_per_minute else None
+        self.window = AdaptiveWindow(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay / 2)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def run(self, func, tokens=1):
+        attempt = 0
+        while True:
+            remaining_time()
+            self.window.acquire()
+            if self.requests:
+                self.requests.acquire(1)
+            if self.tokens:
+                self.tokens.acquire(tokens)
+            try:
+                result = func()
+            except HttpError as exc:
+                self.window.release(failed=exc.status in RETRY_STATUSES)
+                if exc.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                retry_after = parse_retry_after(exc.headers.get('retry-after'))
+                with self._lock:
+                    self.throttled += 1
+            except RETRY_ERRORS:
+                self.window.release(failed=True)
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = None
+            except BaseException:
+                self.window.release()
+                raise
+            else:
+                self.window.release()
+                return result
+            with self._lock:
+                self.retries += 1
+            self._sleep(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    def summary(self):
+        return (f"Planificador IA: {self.retries} reintentos, {self.throttled} respuestas 429/5xx, "
+                f"ventana de concurrencia final {self.window.limit}/{self.window.max_size}")
+
+
+_SCHEDULER = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def configure_scheduler(**options):
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        _SCHEDULER = RequestScheduler(**options)
+    return _SCHEDULER
+
+
+def get_scheduler():
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = RequestScheduler()
+        return _SCHEDULER
@@ -19,15 +19,16 @@ def extract_url(text: str) -> str | None:
     return match.group(0).rstrip('"\'.,')
 
 
-def sanitize_json_text(text: str) -> str:
+def sanitize_json_text(text: str, array: bool = False) -> str:
     if not text:
         return ""
     cleaned = text.strip()
     fence = re.search(r"```(?:json)?\s*([\s\S]+?)```", cleaned, re.I)
     if fence:
         cleaned = fence.group(1).strip()
-    start = cleaned.find('{')
-    end = cleaned.rfind('}')
+    opener, closer = ('[', ']') if array else ('{', '}')
+    start = cleaned.find(opener)
+    end = cleaned.rfind(closer)
     if start != -1 and end != -1 and end > start:
         cleaned = cleaned[start:end + 1]
     return cleaned.strip()
@@ -1,18 +1,221 @@
+from functools import lru_cache
 from pathlib import Path
 import json
 
-try:
-    from jsonschema import Draft7Validator
-except ImportError:  # fallback when jsonschema is unavailable
-    Draft7Validator = None
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / 'docs' / 'ai_contract.schema.json'
+IGNORED_KEYWORDS = {'$schema', 'default', 'description', 'title'}
+TYPE_SOURCES = {
+    'object': 'isinstance({v}, dict)',
+    'array': 'isinstance({v}, list)',
+    'string': 'isinstance({v}, str)',
+    'boolean': 'isinstance({v}, bool)',
+    'null': '{v} is None',
+    'number': '(isinstance({v}, (int, float)) and not isinstance({v}, bool))',
+    'integer': '(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())',
+}
+TYPE_TESTS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool) or isinstance(v, float) and v.is_integer(),
+}
 
-SCHEMA_PATH = Path('docs/ai_contract.schema.json')
-SCHEMA = json.loads(SCHEMA_PATH.read_text(encoding='utf-8'))
-VALIDATOR = Draft7Validator(SCHEMA) if Draft7Validator else None
+
+@lru_cache(maxsize=None)
+def get_schema():
+    return json.loads(SCHEMA_PATH.read_text(encoding='utf-8'))
+
+
+def contract_sections():
+    return tuple(get_schema().get('properties', {}))
+
+
+def required_sections():
+    return tuple(get_schema().get('required', []))
+
+
+def schema_types(schema):
+    types = schema.get('type')
+    if types is None:
+        return []
+    return [types] if isinstance(types, str) else list(types)
+
+
+class SchemaCompiler:
+    def __init__(self):
+        self.lines = []
+        self.counter = 0
+
+    def variable(self):
+        self.counter += 1
+        return f"v{self.counter}"
+
+    def block(self, header, body, indent):
+        if body:
+            self.lines.append('    ' * indent + header)
+            self.lines.extend(body)
+
+    def fail_if(self, condition, indent):
+        pad = '    ' * indent
+        self.lines.append(f"{pad}if {condition}:")
+        self.lines.append(f"{pad}    return False")
+
+    def nested(self, schema, var, indent):
+        outer = self.lines
+        self.lines = []
+        self.emit(schema, var, indent)
+        body, self.lines = self.lines, outer
+        return body
+
+    def emit(self, schema, var, indent):
+        unsupported = set(schema) - IGNORED_KEYWORDS - {
+            'type', 'required', 'properties', 'items', 'minItems', 'maxItems', 'minimum', 'maximum',
+        }
+        if unsupported:
+            raise ValueError(f"Palabras clave del schema no soportadas: {', '.join(sorted(unsupported))}")
+        types = schema_types(schema)
+        if types:
+            if any(name not in TYPE_SOURCES for name in types):
+                raise ValueError(f"Tipo de schema no soportado: {types}")
+            checks = ' or '.join(TYPE_SOURCES[name].format(v=var) for name in types)
+            self.fail_if(f"not ({checks})", indent)
+        self.emit_object(schema, var, indent, types)
+        self.emit_array(schema, var, indent, types)
+        self.emit_number(schema, var, indent, types)
+
+    def guarded(self, var, kind, indent, types, emit_body):
+        if types == [kind]:
+            emit_body(indent)
+            return
+        outer = self.lines
+        self.lines = []
+        emit_body(indent + 1)
+        body, self.lines = self.lines, outer
+        self.block(f"if {TYPE_SOURCES[kind].format(v=var)}:", body, indent)
+
+    def emit_object(self, schema, var, indent, types):
+        required = schema.get('required', [])
+        properties = schema.get('properties', {})
+        if not required and not properties:
+            return
+
+        def body(level):
+            if required:
+                self.fail_if(f"not ({' and '.join(f'{name!r} in {var}' for name in required)})", level)
+            for name, subschema in properties.items():
+                child = self.variable()
+                inner = level if name in required else level + 1
+                nested = self.nested(subschema, child, inner)
+                if not nested:
+                    continue
+                assign = '    ' * inner + f"{child} = {var}[{name!r}]"
+                if name in required:
+                    self.lines.extend([assign, *nested])
+                else:
+                    self.block(f"if {name!r} in {var}:", [assign, *nested], level)
+
+        self.guarded(var, 'object', indent, types, body)
+
+    def emit_array(self, schema, var, indent, types):
+        if not {'items', 'minItems', 'maxItems'} & set(schema):
+            return
+
+        def body(level):
+            if 'minItems' in schema:
+                self.fail_if(f"len({var}) < {schema['minItems']}", level)
+            if 'maxItems' in schema:
+                self.fail_if(f"len({var}) > {schema['maxItems']}", level)
+            if 'items' in schema:
+                child = self.variable()
+                self.block(f"for {child} in {var}:", self.nested(schema['items'], child, level + 1), level)
+
+        self.guarded(var, 'array', indent, types, body)
+
+    def emit_number(self, schema, var, indent, types):
+        if not {'minimum', 'maximum'} & set(schema):
+            return
+
+        def body(level):
+            if 'minimum' in schema:
+                self.fail_if(f"{var} < {schema['minimum']!r}", level)
+            if 'maximum' in schema:
+                self.fail_if(f"{var} > {schema['maximum']!r}", level)
+
+        self.guarded(var, 'number', indent, types, body)
+
+    def compile(self, schema, name='check'):
+        self.lines = [f"def {name}(v0):"]
+        self.emit(schema, 'v0', 1)
+        self.lines.append("    return True")
+        namespace = {}
+        exec(compile('\n'.join(self.lines), f"<schema {name}>", 'exec'), namespace)
+        return namespace[name]
+
+
+def compile_schema(schema, name='check'):
+    return SchemaCompiler().compile(schema, name)
+
+
+def iter_schema_errors(schema, value, path=()):
+    types = schema_types(schema)
+    if types and not any(TYPE_TESTS[name](value) for name in types):
+        yield path, f"{value!r} is not of type {', '.join(repr(name) for name in types)}"
+        return
+    if isinstance(value, dict):
+        for name in schema.get('required', []):
+            if name not in value:
+                yield path, f"{name!r} is a required property"
+        for name, subschema in schema.get('properties', {}).items():
+            if name in value:
+                yield from iter_schema_errors(subschema, value[name], path + (name,))
+    if isinstance(value, list):
+        if len(value) < schema.get('minItems', 0):
+            yield path, f"{value!r} is too short"
+        if 'maxItems' in schema and len(value) > schema['maxItems']:
+            yield path, f"{value!r} is too long"
+        for idx, item in enumerate(value if 'items' in schema else []):
+            yield from iter_schema_errors(schema['items'], item, path + (idx,))
+    if TYPE_TESTS['number'](value):
+        if 'minimum' in schema and value < schema['minimum']:
+            yield path, f"{value!r} is less than the minimum of {schema['minimum']!r}"
+        if 'maximum' in schema and value > schema['maximum']:
+            yield path, f"{value!r} is greater than the maximum of {schema['maximum']!r}"
+
+
+@lru_cache(maxsize=None)
+def get_checker(section=None):
+    schema = get_schema() if section is None else get_schema().get('properties', {}).get(section)
+    if schema is None:
+        return None
+    return compile_schema(schema, f"check_{section or 'contract'}")
+
+
+def contract_errors(contract):
+    if get_checker()(contract):
+        return []
+    return [('/'.join(str(part) for part in path), message)
+            for path, message in iter_schema_errors(get_schema(), contract)]
 
 
 def validate_contract(contract):
-    if not VALIDATOR:
+    if get_checker()(contract):
         return True, []
-    errors = sorted(VALIDATOR.iter_errors(contract), key=lambda e: e.path)
-    return not errors, [error.message for error in errors]
+    errors = [message for _, message in iter_schema_errors(get_schema(), contract)]
+    return not errors, errors
+
+
+def validate_contracts(contracts):
+    check = get_checker()
+    return [(True, []) if check(contract) else validate_contract(contract) for contract in contracts]
+
+
+def validate_section(name, value):
+    check = get_checker(name)
+    if check is None or check(value):
+        return True, []
+    errors = [message for _, message in iter_schema_errors(get_schema()['properties'][name], value)]
+    return not errors, errors
+
@@ -0,0 +1,69 @@
+import tarfile
+import zipfile
+
+import pytest
+
+from src.archive import ArchiveWriter
+from src.generator import ArtifactStream
+from src.local_stub import module as stub
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar.gz"])
+def test_archive_writer_streams_entries_without_spooling(tmp_path, suffix):
+    target = tmp_path / f"generados{suffix}"
+    writer = ArchiveWriter(target)
+    writer.write(writer.output_dir / "test/java/A.java", "class A {}")
+    writer.write(writer.output_dir / "test/resources/features/a.feature", "Feature: A")
+    assert writer.finish() == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == [target.name]
+    if suffix == ".zip":
+        with zipfile.ZipFile(target) as archive:
+            assert archive.read("test/java/A.java") == b"class A {}"
+    else:
+        with tarfile.open(target) as archive:
+            assert archive.extractfile("test/resources/features/a.feature").read() == b"Feature: A"
+
+
+def test_unfinished_archive_leaves_no_partial_file(tmp_path):
+    writer = ArchiveWriter(tmp_path / "generados.zip")
+    writer.write(writer.output_dir / "a.txt", "a")
+    del writer
+    assert list(tmp_path.iterdir()) == []
+
+
+def login_contracts():
+    cases = [{'id': f"TC-{idx}", 'title': 'Login', 'url': 'https://example.org/login', 'tags': [],
+              'steps': [f'Ingresar "user{idx}" en el campo email', 'Hacer click en el botón Ingresar']}
+             for idx in range(2)]
+    return [stub.buildContract(case, registry={}) for case in cases]
+
+
+def stream_into(writer, output_dir):
+    stream = ArtifactStream(output_dir, writer, workers=1, chunk_jobs=1)
+    for contract in login_contracts():
+        stream.add(contract)
+    stream.finish()
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar"])
+def test_paths_colliding_across_chunks_keep_the_latest_entry(tmp_path, recwarn, suffix):
+    stream_into(None, tmp_path / "dir")
+    expected = {path.relative_to(tmp_path / "dir").as_posix(): path.read_bytes()
+                for path in (tmp_path / "dir").rglob("*") if path.is_file()}
+
+    target = tmp_path / f"generados{suffix}"
+    writer = ArchiveWriter(target)
+    stream_into(writer, writer.output_dir)
+    assert writer.finish() == len(expected)
+    if suffix == ".zip":
+        with zipfile.ZipFile(target) as archive:
+            names = archive.namelist()
+            entries = {name: archive.read(name) for name in names}
+    else:
+        with tarfile.open(target) as archive:
+            names = archive.getnames()
+            entries = {name: archive.extractfile(name).read() for name in names}
+    assert len(names) == len(set(names))
+    assert entries == expected
+    assert not [warning for warning in recwarn if "Duplicate name" in str(warning.message)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["dir", target.name])
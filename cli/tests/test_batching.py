@@ -0,0 +1,24 @@
+import pytest
+
+from src.gemini_client import MAX_BATCH_OUTPUT_TOKENS, estimate_output_tokens, plan_batches
+from src.pipeline import FetchOptions, fetch_contracts
+
+
+def make_cases(count, steps):
+    return [{'id': f"TC-{idx}", 'title': f"Caso {idx}", 'url': 'https://example.org',
+             'steps': [f"Paso {step}" for step in range(steps)]} for idx in range(count)]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_batches_fit_the_output_token_budget(compact):
+    cases = make_cases(100, 12)
+    batches = plan_batches(cases, max_cases=50, max_chars=10 ** 6, compact=compact)
+    assert sum(len(batch) for batch in batches) == len(cases)
+    for batch in batches:
+        assert sum(estimate_output_tokens(case, compact) for case in batch) <= MAX_BATCH_OUTPUT_TOKENS
+    assert max(len(batch) for batch in batches) < 50
+
+
+def test_batch_size_is_rejected_for_other_backends():
+    with pytest.raises(ValueError, match="--batch-size"):
+        fetch_contracts(make_cases(2, 3), FetchOptions(service_url='local', batch_size=5))
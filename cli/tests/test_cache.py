@@ -0,0 +1,36 @@
+import src.cache as cache_module
+from src.cache import ContractCache
+
+CASE = {'id': 'TC-01', 'title': 'Login', 'url': 'https://example.org/login', 'tags': [],
+        'steps': ['Ingresar "ana" en el campo email', 'Hacer click en el botón Ingresar']}
+CONTRACT = {'meta': {'caseId': 'TC-01', 'title': 'Login'}}
+
+
+def test_hits_equivalent_cases_and_misses_changed_ones(tmp_path):
+    cache = ContractCache(tmp_path)
+    assert cache.get(CASE, 'gemini') is None
+    cache.put(CASE, 'gemini', CONTRACT)
+
+    spaced = dict(CASE, title='  Login ', steps=[step.replace(' ', '  ') for step in CASE['steps']])
+    assert cache.get(spaced, 'gemini') == CONTRACT
+    assert cache.get(dict(CASE, steps=CASE['steps'][:1]), 'gemini') is None
+    assert cache.get(CASE, 'http://localhost:8000/contract') is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_prompt_version_change_invalidates_keys(tmp_path, monkeypatch):
+    ContractCache(tmp_path).put(CASE, 'gemini', CONTRACT)
+    monkeypatch.setattr(cache_module, 'PROMPT_VERSION', 'nueva')
+    cache = ContractCache(tmp_path)
+    assert cache.get(CASE, 'gemini') is None
+    cache.put(CASE, 'gemini', CONTRACT)
+    assert cache.get(CASE, 'gemini') == CONTRACT
+
+
+def test_schema_change_invalidates_keys(tmp_path, monkeypatch):
+    ContractCache(tmp_path).put(CASE, 'gemini', CONTRACT)
+    schema = cache_module.get_schema()
+    monkeypatch.setattr(cache_module, 'get_schema', lambda: dict(schema, title='otro schema'))
+    assert ContractCache(tmp_path).get(CASE, 'gemini') is None
+    monkeypatch.undo()
+    assert ContractCache(tmp_path).get(CASE, 'gemini') == CONTRACT
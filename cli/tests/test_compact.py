@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.cache import ContractCache
+from src.compact import expand_compact
+from src.parser import parse_cases
+from src.pipeline import FetchOptions, fetch_contracts
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def compact_payload(case):
+    return {
+        'caseId': case['id'], 'title': case['title'], 'url': case['url'], 'tags': case.get('tags', []),
+        'steps': [['When', text, None, 'css', f"#paso-{idx}", 0.9] for idx, text in enumerate(case['steps'])],
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        case = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        if case['id'] == 'TC-01':
+            time.sleep(0.3)
+        body = json.dumps(compact_payload(case)).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def glue(contracts):
+    return [[(step['glueClass'], step['methodName'], step['reusesExisting']) for step in contract['stepDefinitions']]
+            for contract in contracts]
+
+
+def test_compact_glue_does_not_depend_on_arrival_order():
+    cases = parse_cases(ROOT / "sample_input.txt")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/contract"
+    try:
+        serial = fetch_contracts(cases, FetchOptions(service_url=url, compact=True))
+        concurrent = fetch_contracts(cases, FetchOptions(service_url=url, compact=True, concurrency=2))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert glue(serial) == glue(concurrent)
+    assert {step[0] for step in glue(serial)[0]} == {'com.autogen.steps.BusquedaMercadoLibreFiltroCamisetasSteps'}
+
+
+def test_expand_compact_is_stateless():
+    first, second = parse_cases(ROOT / "sample_input.txt")
+    alone = expand_compact(compact_payload(second), second)
+    expand_compact(compact_payload(first), first)
+    assert expand_compact(compact_payload(second), second) == alone
+    assert not any(step['reusesExisting'] for step in alone['stepDefinitions'])
+
+
+def test_cache_key_includes_wire_format(tmp_path):
+    case = {'id': 'TC-01', 'title': 'Caso', 'url': 'https://example.org', 'steps': ['Paso']}
+    full = ContractCache(tmp_path)
+    compact = ContractCache(tmp_path, wire_format='compact')
+    assert full.key(case, 'http://ia') != compact.key(case, 'http://ia')
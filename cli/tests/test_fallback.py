@@ -0,0 +1,67 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.fallback import FallbackPolicy, is_fallback
+from src.http_client import ConnectionPool
+
+CASE = {'id': 'TC-01', 'title': 'Caso', 'url': 'https://example.org', 'tags': [], 'steps': ['Hacer click en Ingresar']}
+
+
+def test_hedge_answers_after_primary_fails_fast():
+    calls = []
+
+    def request():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(0.25)
+            raise RuntimeError("primaria caída")
+        time.sleep(0.15)
+        return {'notes': ['ia']}
+
+    policy = FallbackPolicy(latency_budget=0.2, hedge=True, use_stub=True)
+    assert policy.call(CASE, request) == {'notes': ['ia']}
+    assert policy.fallbacks == 0 and policy.hedged == 1
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(2)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_abandoned_request_is_bounded_by_the_budget():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/contract"
+    pool = ConnectionPool(timeout=30)
+    finished = threading.Event()
+    errors = []
+
+    def request():
+        try:
+            return pool.post_json(url, CASE)
+        except Exception as exc:
+            errors.append(exc)
+            raise
+        finally:
+            finished.set()
+
+    try:
+        contract = FallbackPolicy(latency_budget=0.2, use_stub=True).call(CASE, request)
+        assert is_fallback(contract)
+        assert finished.wait(1)
+        assert isinstance(errors[0], TimeoutError)
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
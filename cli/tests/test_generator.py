@@ -0,0 +1,80 @@
+import re
+
+from src.generator import ArtifactStream, OutlineIndex, PageIndex, StepIndex
+from src.local_stub import module as stub
+
+
+def login_contracts(*cases):
+    return [stub.buildContract({'id': f"TC-{idx}", 'title': title, 'url': url, 'tags': [],
+                                'steps': [f'Ingresar "{user}" en el campo email', 'Hacer click en el botón Ingresar']},
+                               registry={})
+            for idx, (title, user, url) in enumerate(cases)]
+
+
+def render(output_dir, contracts, **indexes):
+    stream = ArtifactStream(output_dir, workers=1, **indexes)
+    for contract in contracts:
+        stream.add(contract)
+    stream.finish()
+    return {path.relative_to(output_dir).as_posix(): path.read_text(encoding='utf-8')
+            for path in output_dir.rglob('*') if path.is_file()}
+
+
+def test_same_step_expression_yields_one_glue_method(tmp_path):
+    contracts = login_contracts(('Login', 'ana', 'https://example.org/login'),
+                                ('Login', 'ana', 'https://example.org/login'))
+    index = StepIndex()
+    files = render(tmp_path, contracts, step_index=index)
+
+    assert (index.total, len(index.expressions), index.duplicates) == (4, 2, 2)
+    assert index.conflicts == [] and index.variants == []
+    glue = [content for name, content in files.items() if name.startswith('test/java/com/autogen/steps/')]
+    assert len(glue) == 1
+    assert glue[0].count('@Given("Ingresar {string} en el campo email")') == 1
+    assert glue[0].count('@Then("Hacer click en el botón Ingresar")') == 1
+
+
+def test_pages_on_the_same_host_and_path_merge_into_one_class(tmp_path):
+    contracts = login_contracts(('Login', 'ana', 'https://www.example.org/login'),
+                                ('Acceso', 'bob', 'https://example.org/login/'),
+                                ('Inicio', 'eva', 'https://example.org/'))
+    index = PageIndex()
+    files = render(tmp_path, contracts, page_index=index)
+
+    pages = sorted(name for name in files if name.startswith('test/java/com/autogen/pages/'))
+    assert pages == ['test/java/com/autogen/pages/ExampleOrgLoginPage.java',
+                     'test/java/com/autogen/pages/ExampleOrgPage.java',
+                     'test/java/com/autogen/pages/WebBasePage.java']
+    assert not any(re.search(r"\b(LoginPage|AccesoPage)\b", content) for content in files.values())
+    report = index.report()
+    login = report['com.autogen.pages.ExampleOrgLoginPage']
+    assert list(login['fields']) == ['ingresaranaenelcampoemail', 'hacerclickenelbotningresar']
+    assert [(source['caseId'], source['className']) for source in login['sources']] == [
+        ('TC-0', 'com.autogen.pages.LoginPage'), ('TC-1', 'com.autogen.pages.AccesoPage')]
+    assert login['sources'][1]['fields'] == {'ingresarbobenelcampoemail': 'ingresaranaenelcampoemail',
+                                             'hacerclickenelbotningresar': 'hacerclickenelbotningresar'}
+    assert [source['caseId'] for source in report['com.autogen.pages.ExampleOrgPage']['sources']] == ['TC-2']
+
+
+def test_cases_differing_only_in_literals_become_one_outline(tmp_path):
+    contracts = login_contracts(('Login', 'ana', 'https://example.org/login'),
+                                ('Acceso', 'bob', 'https://example.org/login'))
+    contracts += login_contracts(('Registro', 'eva', 'https://example.org/registro'))
+    contracts[2]['gherkin']['scenarios'][0]['steps'].pop()
+    index = OutlineIndex()
+    files = render(tmp_path, contracts, outline_index=index)
+
+    features = sorted(name for name in files if name.endswith('.feature'))
+    assert features == ['test/resources/features/login.feature', 'test/resources/features/registro.feature']
+    assert files['test/resources/features/login.feature'].splitlines()[2:] == [
+        '  Scenario Outline: <caso>',
+        '    Given Ingresar "<usuario>" en el campo email',
+        '    Then Hacer click en el botón Ingresar',
+        '',
+        '    Examples:',
+        '      | caso | usuario |',
+        '      | Login | ana |',
+        '      | Acceso | bob |',
+    ]
+    assert 'Scenario Outline' not in files['test/resources/features/registro.feature']
+    assert index.cases == 3
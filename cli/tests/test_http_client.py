@@ -0,0 +1,38 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.http_client import ConnectionPool
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        Handler.connections.add(self.client_address)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_stream_content_length_then_reuse_connection():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/contract"
+    pool = ConnectionPool(pool_size=1, timeout=5)
+    try:
+        streamed = b"".join(pool.post_json_stream(url, {"case": "TC-01"}))
+        assert streamed == b'{"ok": true}'
+        assert pool.post_json(url, {"case": "TC-01"}) == {"ok": True}
+        assert len(Handler.connections) == 1
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
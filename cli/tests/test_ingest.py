@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.ingest import iter_case_files
+
+ROOT = Path(__file__).resolve().parents[2]
+MAIN = ROOT / "cli" / "main.py"
+
+
+def write_cases(directory, name, *ids):
+    path = directory / name
+    path.write_text(''.join(f"# Caso {case_id}\nid: {case_id}\npasos:\n- Abrir la página de inicio\n\n"
+                            for case_id in ids), encoding="utf-8")
+    return path
+
+
+def test_parallel_reads_keep_input_order(tmp_path):
+    paths = [write_cases(tmp_path, "a.txt", *(f"TC-A{idx}" for idx in range(2000))),
+             write_cases(tmp_path, "b.txt", "TC-B1"),
+             write_cases(tmp_path, "c.txt", "TC-C1", "TC-C2")]
+    read = [(path, [case["id"] for case in cases]) for path, cases in iter_case_files(paths, workers=3)]
+    assert [path for path, _ in read] == paths
+    assert read[1][1] == ["TC-B1"] and read[2][1] == ["TC-C1", "TC-C2"]
+
+
+@pytest.mark.parametrize("extra", [[], ["--case", "TC-02"]])
+def test_duplicate_ids_across_files_stop_before_generating(tmp_path, extra):
+    write_cases(tmp_path, "a.txt", *(f"TC-{idx:02d}" for idx in range(1, 600)))
+    write_cases(tmp_path, "b.txt", "TC-900", "TC-02")
+    result = subprocess.run([sys.executable, str(MAIN), "generate", "a.txt", "b.txt", "--output", "out", *extra],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert "ID de caso duplicado entre archivos: TC-02 (a.txt, b.txt)" in result.stdout + result.stderr
+    assert not (tmp_path / "out").exists()
+    assert not (tmp_path / ".iatg_history").exists()
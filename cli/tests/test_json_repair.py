@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import src.gemini_client as gemini_client
+from src.json_repair import missing_sections, repair_json
+from src.local_stub import module as stub
+from src.validator import required_sections
+
+CASE = {'id': 'TC-01', 'title': 'Login', 'url': 'https://example.org/login', 'tags': [],
+        'steps': ['Ingresar "ana" en el campo email', 'Hacer click en el botón Ingresar']}
+
+
+@pytest.mark.parametrize("text, array, expected, repaired", [
+    ('{"a": 1}', False, {'a': 1}, False),
+    ('```json\n{"a": [1, 2]}\n```', False, {'a': [1, 2]}, False),
+    ('Aquí va: {"a": 1} y listo {"b": 2}', False, {'a': 1}, False),
+    ('{"a": 1,}', False, {'a': 1}, False),
+    ('{"a": "hol', False, {'a': 'hol'}, True),
+    ('{"a": "x\\"y', False, {'a': 'x"y'}, True),
+    ('{"a": 1, "b":', False, {'a': 1}, True),
+    ('{"a": 1, "b": ', False, {'a': 1}, True),
+    ('{"a": [1, 2,', False, {'a': [1, 2]}, True),
+    ('{"a": {"b": [1, {"c": 2', False, {'a': {'b': [1, {'c': 2}]}}, True),
+    ('{"a": [1}', False, {'a': [1]}, True),
+    ('[{"a": 1}, {"a": 2', True, [{'a': 1}, {'a': 2}], True),
+])
+def test_repair_json(text, array, expected, repaired):
+    assert repair_json(text, array=array) == (expected, repaired)
+
+
+@pytest.mark.parametrize("text", ['sin json', '[1, 2]', '{"a" 1}'])
+def test_repair_json_rejects_malformed_input(text):
+    with pytest.raises(ValueError):
+        repair_json(text)
+
+
+def full_contract():
+    return stub.buildContract(CASE, registry={})
+
+
+def without(name):
+    def change(contract):
+        del contract[name]
+    return change
+
+
+def first_definition_only(contract):
+    contract['stepDefinitions'] = contract['stepDefinitions'][:1]
+
+
+def first_method_only(contract):
+    contract['pageObjects'][0]['methods'] = contract['pageObjects'][0]['methods'][:1]
+
+
+def other_literal(contract):
+    contract['gherkin']['scenarios'][0]['steps'][0]['text'] = 'Ingresar "bob" en el campo email'
+
+
+@pytest.mark.parametrize("change, missing, uncovered", [
+    (None, [], []),
+    (other_literal, [], []),
+    (without('pageObjects'), ['pageObjects'], []),
+    (without('stepDefinitions'), ['stepDefinitions'], []),
+    (first_definition_only, [], [CASE['steps'][1]]),
+    (first_method_only, ['pageObjects'], []),
+])
+def test_missing_sections(change, missing, uncovered):
+    contract = full_contract()
+    if change:
+        change(contract)
+    assert missing_sections(CASE, contract, required_sections()) == (missing, uncovered)
+
+
+def test_complete_contract_requests_only_missing_sections(monkeypatch):
+    full = full_contract()
+    truncated = full_contract()
+    del truncated['pageObjects']
+    first_definition_only(truncated)
+    prompts = []
+
+    def call_gemini_api(prompt, max_output_tokens=None):
+        prompts.append(prompt)
+        text = json.dumps({'pageObjects': full['pageObjects'], 'stepDefinitions': full['stepDefinitions'][1:]})
+        return {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+
+    monkeypatch.setattr(gemini_client, 'call_gemini_api', call_gemini_api)
+    completed = gemini_client.complete_contract(CASE, truncated)
+    assert len(prompts) == 1
+    assert CASE['steps'][1] in prompts[0]
+    assert completed['stepDefinitions'] == full['stepDefinitions']
+    assert completed['pageObjects'] == full['pageObjects']
+    assert gemini_client.complete_contract(CASE, full) == full
+    assert len(prompts) == 1
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.local_stub import module as stub
+from src.manifest import MANIFEST_NAME, ArtifactWriter
+from src.parser import parse_cases
+
+ROOT = Path(__file__).resolve().parents[2]
+MAIN = ROOT / "cli" / "main.py"
+
+
+def generate(workdir, *extra, env=None, check=True):
+    result = subprocess.run([sys.executable, str(MAIN), "generate", "sample_input.txt", "--output", "out", *extra],
+                            cwd=workdir, capture_output=True, text=True, check=check, env=env)
+    return result.stdout if check else result
+
+
+def artifacts(output):
+    return sorted(path.relative_to(output).as_posix() for path in output.rglob("*")
+                  if path.is_file() and path.name != MANIFEST_NAME)
+
+
+def test_filtered_generate_keeps_other_cases(tmp_path):
+    shutil.copy(ROOT / "sample_input.txt", tmp_path / "sample_input.txt")
+    generate(tmp_path)
+    full = artifacts(tmp_path / "out")
+
+    summary = generate(tmp_path, "--case", "TC-02")
+    assert "0 eliminados" in summary
+    assert artifacts(tmp_path / "out") == full
+
+    generate(tmp_path)
+    assert artifacts(tmp_path / "out") == full
+
+
+def test_unfiltered_finish_prunes_stale_files(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    writer.write(tmp_path / "a.txt", "a")
+    writer.write(tmp_path / "sub" / "b.txt", "b")
+    writer.finish()
+
+    filtered = ArtifactWriter(tmp_path, prune=False)
+    filtered.write(tmp_path / "a.txt", "a")
+    filtered.finish()
+    assert (tmp_path / "sub" / "b.txt").exists()
+
+    full = ArtifactWriter(tmp_path)
+    full.write(tmp_path / "a.txt", "a")
+    full.finish()
+    assert not (tmp_path / "sub").exists()
+    assert full.deleted == {"sub/b.txt"}
+
+
+class GeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    contracts = {}
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        prompt = payload["contents"][0]["parts"][0]["text"]
+        if "no cumple el schema" in prompt:
+            text = "{}"
+        else:
+            text = next(json.dumps(contract) for case_id, contract in self.contracts.items() if case_id in prompt)
+        body = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_invalid_contract_keeps_previous_artifacts(tmp_path):
+    shutil.copy(ROOT / "sample_input.txt", tmp_path / "sample_input.txt")
+    generate(tmp_path)
+    full = artifacts(tmp_path / "out")
+
+    contracts = {case["id"]: stub.buildContract(case, registry={}) for case in parse_cases(ROOT / "sample_input.txt")}
+    del contracts["TC-02"]["pageObjects"]
+    GeminiHandler.contracts = contracts
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GeminiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = dict(os.environ, GEMINI_API_KEY="test", GEMINI_API_URL=f"http://127.0.0.1:{server.server_address[1]}/gen")
+    try:
+        result = generate(tmp_path, "--service-url", "gemini", "--no-cache", env=env, check=False)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result.returncode != 0
+    assert "TC-02" in result.stderr
+    assert "0 eliminados" in result.stdout
+    assert artifacts(tmp_path / "out") == full
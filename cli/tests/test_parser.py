@@ -0,0 +1,64 @@
+import json
+import os
+
+from src.parser import CaseIndex, CaseReader, find_cases, parse_cases
+
+SOURCE = """# Búsqueda de camisetas
+id: TC-01
+url: https://www.mercadolibre.cl
+tags: smoke @busqueda
+pasos:
+1. Buscar el producto "camiseta de fútbol"
+2) Validar resultados
+
+# Caso sin id
+- Abrir la página de inicio
+
+# Selección de registro
+id: TC-03
+pasos:
+- Seleccionar el primer registro
+"""
+
+
+def write_source(tmp_path, text=SOURCE):
+    path = tmp_path / "casos.txt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def stream_cases(text):
+    reader = CaseReader()
+    cases = [case for case in map(reader.feed, text.splitlines(keepends=True)) if case]
+    return cases + [reader.push()]
+
+
+def test_streamed_and_indexed_reads_match_parse_cases(tmp_path):
+    path = write_source(tmp_path)
+    expected = parse_cases(path)
+    assert [case["id"] for case in expected] == ["TC-01", "case-2", "TC-03"]
+    assert expected[0]["tags"] == ["@smoke", "@busqueda"]
+    assert expected[1]["steps"] == ["Abrir la página de inicio"]
+
+    assert stream_cases(SOURCE) == expected
+    index = CaseIndex.open(path)
+    assert list(index.iter_cases(range(len(index.ids)))) == expected
+    assert find_cases(path, ids=["TC-03"], tags=["@smoke"]) == [expected[0], expected[2]]
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path):
+    path = write_source(tmp_path)
+    CaseIndex.open(path)
+    sidecar = CaseIndex.index_path(path)
+    assert json.loads(sidecar.read_text(encoding="utf-8"))["ids"] == ["TC-01", "case-2", "TC-03"]
+
+    stat = os.stat(path)
+    path.write_text(SOURCE.replace("TC-03", "TC-09"), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert CaseIndex.load(path) is None
+    assert find_cases(path, ids=["TC-09"])[0]["steps"] == ["Seleccionar el primer registro"]
+    assert json.loads(sidecar.read_text(encoding="utf-8"))["ids"] == ["TC-01", "case-2", "TC-09"]
+
+    sidecar.write_text("{no es json", encoding="utf-8")
+    assert CaseIndex.open(path).ids == ["TC-01", "case-2", "TC-09"]
+    assert CaseIndex.load(path) is not None
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from src.generator import PARALLEL_RENDER_MIN_JOBS, generate_artifacts, render_jobs
+from src.local_stub import module as stub
+from src.parser import parse_cases
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def sample_contracts(copies=20):
+    cases = parse_cases(ROOT / "sample_input.txt")
+    contracts = []
+    for copy in range(copies):
+        for case in cases:
+            case = dict(case, id=f"{case['id']}-{copy}", title=f"{case['title']} {copy}")
+            contracts.append(stub.buildContract(case, registry={}))
+    return contracts
+
+
+def tree_files(output_dir):
+    return {path.relative_to(output_dir).as_posix(): path.read_bytes()
+            for path in output_dir.rglob("*") if path.is_file()}
+
+
+def test_parallel_render_matches_serial_render_file_by_file(tmp_path):
+    contracts = sample_contracts()
+    assert len(render_jobs(contracts)) >= PARALLEL_RENDER_MIN_JOBS
+
+    serial = generate_artifacts(contracts, tmp_path / "serial", workers=1)
+    parallel = generate_artifacts(contracts, tmp_path / "parallel", workers=2)
+    assert list(parallel) == list(serial)
+    serial_files = tree_files(tmp_path / "serial")
+    parallel_files = tree_files(tmp_path / "parallel")
+    assert sorted(parallel_files) == sorted(serial_files)
+    for name, data in serial_files.items():
+        assert parallel_files[name] == data, name
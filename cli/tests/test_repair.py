@@ -0,0 +1,47 @@
+import pytest
+
+from main import ensure_all_valid
+from src.local_stub import module as stub
+from src.pipeline import FetchOptions, settle
+from src.repair import ContractRepairer, ContractValidationError
+
+CASE = {'id': 'TC-09', 'title': 'Login', 'url': 'https://example.org', 'tags': [], 'steps': ['Hacer click en Ingresar']}
+
+
+def invalid_contract():
+    contract = stub.buildContract(CASE, registry={})
+    del contract['pageObjects']
+    return contract
+
+
+def test_invalid_contract_fails_fast_without_repair_path():
+    repairer = ContractRepairer(request=None)
+    with pytest.raises(ValueError) as error:
+        settle(0, lambda: repairer.ensure_valid(CASE, invalid_contract()))
+    assert not isinstance(error.value, ContractValidationError)
+    assert "intentos" not in str(error.value)
+
+
+def test_unrepaired_contract_is_reported_with_attempts_made():
+    calls = []
+
+    def request(case, current, errors, sections):
+        calls.append(sections)
+        return {}
+
+    options = FetchOptions(repair=ContractRepairer(max_attempts=3, request=request))
+    assert settle(0, lambda: options.repair.ensure_valid(CASE, invalid_contract())) == (0, None)
+    assert len(calls) == 3
+    with pytest.raises(ValueError, match=r"TC-09 \(3 intentos\)"):
+        ensure_all_valid(options)
+
+
+def test_repaired_contract_is_valid():
+    valid = stub.buildContract(CASE, registry={})
+
+    def request(case, current, errors, sections):
+        return {name: valid[name] for name in sections}
+
+    repairer = ContractRepairer(request=request)
+    assert repairer.ensure_valid(CASE, invalid_contract())['pageObjects'] == valid['pageObjects']
+    assert repairer.failed() == []
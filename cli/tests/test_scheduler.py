@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.http_client import ConnectionPool, HttpError
+from src.scheduler import RequestScheduler, TokenBucket
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttle = 0
+    requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        type(self).requests += 1
+        if type(self).requests <= type(self).throttle:
+            body = b'{"error": "quota"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "3")
+        else:
+            body = b'{"ok": true}'
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def throttling_server():
+    handler = type("Handler", (ThrottlingHandler,), {})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pool = ConnectionPool(pool_size=1, timeout=5)
+    try:
+        yield handler, pool, f"http://127.0.0.1:{server.server_address[1]}/gen"
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_retry_after_delays_the_retry_and_shrinks_the_window(throttling_server):
+    handler, pool, url = throttling_server
+    handler.throttle = 2
+    sleeps = []
+    scheduler = RequestScheduler(max_concurrency=8, base_delay=0.2, sleep=sleeps.append)
+
+    assert scheduler.run(lambda: pool.post_json(url, {"case": "TC-01"})) == {"ok": True}
+    assert handler.requests == 3
+    assert len(sleeps) == 2
+    assert all(3.0 <= delay <= 3.1 for delay in sleeps)
+    assert (scheduler.retries, scheduler.throttled) == (2, 2)
+    assert scheduler.window.limit == 2
+
+    scheduler.run(lambda: pool.post_json(url, {"case": "TC-02"}))
+    assert scheduler.window.limit == 3
+
+
+def test_persistent_throttling_gives_up_after_max_retries(throttling_server):
+    handler, pool, url = throttling_server
+    handler.throttle = 10
+    sleeps = []
+    scheduler = RequestScheduler(max_retries=2, max_concurrency=4, sleep=sleeps.append)
+
+    with pytest.raises(HttpError) as error:
+        scheduler.run(lambda: pool.post_json(url, {"case": "TC-01"}))
+    assert error.value.status == 429
+    assert handler.requests == 3
+    assert len(sleeps) == 2
+    assert scheduler.window.limit == 1
+
+
+def test_token_bucket_waits_for_refill_once_exhausted():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(60, clock=lambda: now[0], sleep=sleep)
+    bucket.acquire(60)
+    assert sleeps == []
+    bucket.acquire(30)
+    assert sleeps == [pytest.approx(30.0)]
+    now[0] += 15
+    bucket.acquire(10)
+    assert sleeps == [pytest.approx(30.0)]
@@ -8,8 +8,6 @@ import org.openqa.selenium.support.FindBy;
 import org.openqa.selenium.support.PageFactory;
 
 public class BSquedaMercadoLibreSeleccionarRegistrosPage extends WebBasePage {
-    private static WebDriver driver;
-
     @FindBy(css = "[data-test='step-1']")
     private WebElement navegaramercadolibrehttpswwwmercadolibrecl;
 
@@ -24,7 +22,6 @@ public class BSquedaMercadoLibreSeleccionarRegistrosPage extends WebBasePage {
 
     public BSquedaMercadoLibreSeleccionarRegistrosPage(WebDriver driver) {
         super(driver);
-        BSquedaMercadoLibreSeleccionarRegistrosPage.driver = driver;
         PageFactory.initElements(driver, this);
     }
 
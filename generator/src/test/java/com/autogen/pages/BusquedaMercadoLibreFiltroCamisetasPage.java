@@ -8,8 +8,6 @@ import org.openqa.selenium.support.FindBy;
 import org.openqa.selenium.support.PageFactory;
 
 public class BusquedaMercadoLibreFiltroCamisetasPage extends WebBasePage {
-    private static WebDriver driver;
-
     @FindBy(css = "[data-test='step-1']")
     private WebElement navegaramercadolibrehttpswwwmercadolibrecl;
 
@@ -21,7 +19,6 @@ public class BusquedaMercadoLibreFiltroCamisetasPage extends WebBasePage {
 
     public BusquedaMercadoLibreFiltroCamisetasPage(WebDriver driver) {
         super(driver);
-        BusquedaMercadoLibreFiltroCamisetasPage.driver = driver;
         PageFactory.initElements(driver, this);
     }
 